@@ -0,0 +1,331 @@
+"""
+Benchmarks für Parsing, Import, Matching, Export und die Routen des Webservers
+auf einem synthetischen, reproduzierbaren Projektkorpus.
+
+    python3 benchmark.py --projects 20000                  # messen
+    python3 benchmark.py --projects 20000 --save-baseline  # Ergebnis als Baseline ablegen
+    python3 benchmark.py --projects 20000 --compare        # gegen die Baseline prüfen
+
+Mit --compare endet das Skript mit Exit-Code 1, sobald eine Messung um mehr als
+--tolerance langsamer ist als die Baseline. Baselines sind maschinenabhängig und
+gehören nicht ins Repository.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+import projectMatcher as pm
+
+BASELINE_FILE = 'benchmark_baseline.json'
+PAGE_SIZE = 50
+# Kleinere Verlangsamungen (Sekunden) gelten als Messrauschen, auch wenn sie relativ groß sind
+MIN_DELTA = 0.001
+
+COMPANIES = ['Hays', 'GULP', 'Solcom', 'Computer Futures', 'Etengo', 'Westhouse', 'Allgeier',
+             'Randstad', 'Michael Page', 'Austin Fraser', 'Darwin Recruitment', 'freelance.de']
+TITLE_PREFIXES = ['Senior', 'Junior', 'Lead', '', '', 'Freelance']
+TITLE_ROLES = ['Entwickler', 'Developer', 'Architekt', 'Berater', 'Engineer', 'Consultant']
+CITIES = ['Berlin', 'München', 'Hamburg', 'Köln', 'Frankfurt', 'Remote', 'Stuttgart']
+FILLER = ('Für unseren Kunden suchen wir Unterstützung im Projekt bei der Weiterentwicklung '
+          'einer bestehenden Plattform mit Fokus auf Qualität Wartbarkeit und Betrieb im Team '
+          'agil nach Scrum mit regelmäßigen Reviews und enger Abstimmung mit dem Fachbereich').split()
+
+
+def generate_projects(count, seed=42, now=None):
+    """
+    Erzeugt `count` Projekte im Format der Such-API (wie in _parse_project_json erwartet).
+
+    Gleicher Seed ergibt denselben Korpus: Skills aus SKILL_DICTIONARY, HTML-Beschreibungen
+    mit Listen, Entities und gelegentlich unsauberem Markup (BeautifulSoup-Fallback),
+    Firmen mit schiefer Verteilung und Eintragungsdaten der letzten 60 Tage.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now().replace(microsecond=0)
+    skills = pm.SKILL_DICTIONARY
+    # Wenige Firmen stellen die meisten Projekte (Pareto), dazu ein langer Schwanz
+    companies = COMPANIES + [f"Firma {i} GmbH" for i in range(max(count // 20, 1))]
+
+    for i in range(count):
+        main_skills = rng.sample(skills, 2)
+        title = ' '.join(filter(None, [rng.choice(TITLE_PREFIXES), main_skills[0],
+                                       rng.choice(TITLE_ROLES), f"({rng.choice(CITIES)})"]))
+        items = ''.join(f"<li>{skill} &amp; {rng.choice(FILLER)}</li>"
+                        for skill in main_skills + rng.sample(skills, rng.randint(2, 8)))
+        paragraphs = ''.join(
+            f"<p>{' '.join(rng.choice(FILLER) for _ in range(rng.randint(20, 60)))}</p>"
+            for _ in range(rng.randint(1, 4))
+        )
+        description = f"<h3>Aufgaben</h3>{paragraphs}<ul>{items}</ul><p>Start: ab sofort &ndash; Auslastung 100&nbsp;%</p>"
+        if rng.random() < 0.02:
+            description += "<!-- intern --><p>Kontakt < 24h"
+        company_index = min(int(rng.paretovariate(1.2)) - 1, len(companies) - 1)
+        created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 60))
+        yield {
+            'title': title,
+            'company': companies[company_index],
+            'links': {'project': f"/projekt/bench-{seed}-{i}"},
+            'description': description,
+            'created': created.isoformat(),
+            'topProject': {'until': created.isoformat()} if rng.random() < 0.1 else None,
+            'endcustomer': rng.random() < 0.3,
+        }
+
+
+def generate_pages(count, seed=42, now=None, page_size=PAGE_SIZE):
+    """Projekte in Seiten, wie sie die Such-API liefert."""
+    page = []
+    for project in generate_projects(count, seed, now):
+        page.append(project)
+        if len(page) == page_size:
+            yield {'projects': page}
+            page = []
+    if page:
+        yield {'projects': page}
+
+
+class Benchmark:
+    """Führt die Stufen nacheinander auf einer frischen Datenbank aus und sammelt die Zeiten."""
+
+    def __init__(self, db_path, projects, seed=42, repeat=3, requests=20, workers=1):
+        self.db_path = db_path
+        self.projects = projects
+        self.seed = seed
+        self.repeat = max(1, repeat)
+        self.requests = requests
+        self.workers = workers
+        self.results = {}
+        # Fester Bezugszeitpunkt: ein zweiter Import erzeugt exakt dieselben Projekte
+        self.now = datetime.now().replace(microsecond=0)
+
+    def record(self, name, seconds, rows=None):
+        result = {'seconds': seconds}
+        if rows is not None:
+            result['rows'] = rows
+            result['rows_per_second'] = rows / seconds if seconds else None
+        self.results[name] = result
+        rate = f" ({result['rows_per_second']:.0f} Zeilen/s)" if result.get('rows_per_second') else ""
+        print(f"{name:<44} {seconds * 1000:10.1f} ms{rate}")
+
+    def best_of(self, fn):
+        """Kürzeste von `repeat` Laufzeiten und das Ergebnis des letzten Laufs."""
+        best = None
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            value = fn()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, value
+
+    def run(self):
+        db = pm.FreelancermapDatabase(self.db_path, terms=pm.skill_terms({'benchmark': pm.PROFILE}))
+        scraper = pm.FreelancermapScraper(db, None, None)
+        try:
+            self.bench_parse_and_ingest(db, scraper)
+            self.bench_matching(db)
+            self.bench_export(db)
+        finally:
+            db.close()
+        self.bench_routes()
+        return self.results
+
+    def bench_parse_and_ingest(self, db, scraper):
+        # Seite für Seite wie im Scraper: Speicherbedarf unabhängig von der Korpusgröße
+        ingest_seconds = 0.0
+        for page in generate_pages(self.projects, self.seed, self.now):
+            projects = scraper.parse_page(page)
+            started = time.perf_counter()
+            db.upsert_projects(projects)
+            ingest_seconds += time.perf_counter() - started
+        self.record('ingest (neu)', ingest_seconds, self.projects)
+
+        # Parsen allein (ohne die Zeit des Generators), wiederholbar
+        def parse():
+            seconds = 0.0
+            for page in generate_pages(self.projects, self.seed, self.now):
+                started = time.perf_counter()
+                scraper.parse_page(page)
+                seconds += time.perf_counter() - started
+            return seconds
+        self.record('parse', min(parse() for _ in range(self.repeat)), self.projects)
+
+        # Erneuter Import ohne Änderungen: nur Hash-Vergleich
+        def reingest():
+            for page in generate_pages(self.projects, self.seed, self.now):
+                db.upsert_projects(scraper.parse_page(page))
+        seconds, _ = self.best_of(reingest)
+        self.record('parse + ingest (unverändert)', seconds, self.projects)
+
+    def bench_matching(self, db):
+        matcher = pm.ProjectMatcher(db)
+        profiles = {'benchmark': pm.PROFILE}
+        seconds, results = self.best_of(lambda: matcher.find_matches_multi(
+            profiles, min_score=pm.MIN_SCORE, full=True, workers=self.workers))
+        self.record('matching (vollständig)', seconds, results['benchmark']['scored'])
+        seconds, results = self.best_of(lambda: matcher.find_matches_multi(
+            profiles, min_score=pm.MIN_SCORE, workers=self.workers))
+        self.record('matching (inkrementell)', seconds, results['benchmark']['scored'])
+
+    def bench_export(self, db):
+        profile_hash = db.current_profile_hash('benchmark')
+        rows = db.conn.execute("SELECT COUNT(*) FROM matches WHERE profile_hash = ? AND match_score >= ?",
+                               (profile_hash, pm.MIN_SCORE)).fetchone()[0]
+        for fmt, compress in [('csv', False), ('jsonl', True), ('parquet', False)]:
+            if fmt not in pm.export_formats():
+                continue
+            seconds, _ = self.best_of(lambda: sum(
+                len(chunk) for chunk in pm.iter_export(db.conn, profile_hash, pm.MIN_SCORE, fmt, compress)))
+            self.record(f"export {pm.export_filename('', fmt, compress)[1:]}", seconds, rows)
+
+    def bench_routes(self):
+        try:
+            import webserver
+        except ImportError as e:
+            print(f"Webserver-Routen übersprungen: {e}")
+            return
+        client = webserver.app.test_client()
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("""
+            SELECT id, project_id, match_score FROM matches
+            ORDER BY match_score DESC, id DESC LIMIT ?
+        """, (webserver.MATCHES_PER_PAGE,)).fetchall()
+        conn.close()
+
+        # Bezeichnung (stabil für die Baseline) -> Pfad
+        routes = {'/': '/', '/statistics': '/statistics', '/search?q=python': '/search?q=python',
+                  '/search?q=cloud plattform': '/search?q=cloud%20plattform', '/export': '/export'}
+        if rows:
+            match_id, project_id, score = rows[-1]
+            routes['/?after=<Seite 2>'] = f"/?after={webserver.encode_cursor(score, match_id)}"
+            routes['/project/<id>'] = f"/project/{project_id}"
+        for label, path in routes.items():
+            response = client.get(path)  # Templates kompilieren, Verbindungen öffnen
+            if response.status_code != 200:
+                print(f"{path}: HTTP {response.status_code}")
+                continue
+
+            # Kalt: Seite wird gerendert (Cache-Miss)
+            def cold():
+                webserver.page_cache.clear()
+                client.get(path)
+            seconds, _ = self.best_of(cold)
+            self.record(f"GET {label} (kalt)", seconds)
+            if path == '/export':
+                continue
+
+            # Aus dem Seiten-Cache: Mittel über `requests` Abrufe
+            def cached():
+                for _ in range(self.requests):
+                    client.get(path)
+            seconds, _ = self.best_of(cached)
+            self.record(f"GET {label} (Cache)", seconds / max(self.requests, 1))
+
+
+def compare(results, baseline, tolerance, min_delta=MIN_DELTA):
+    """
+    Vergleicht Messungen mit einer Baseline.
+
+    Returns:
+        list: (Name, Baseline-Sekunden, aktuelle Sekunden) je Messung, die mehr als
+            `tolerance` (relativ) und mehr als `min_delta` Sekunden langsamer ist
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<44} neu (keine Baseline)")
+            continue
+        ratio = result['seconds'] / base['seconds'] if base['seconds'] else 1.0
+        slower = ratio > 1 + tolerance and result['seconds'] - base['seconds'] > min_delta
+        marker = 'REGRESSION' if slower else 'schneller' if ratio < 1 - tolerance else ''
+        print(f"{name:<44} {base['seconds'] * 1000:10.1f} -> {result['seconds'] * 1000:10.1f} ms "
+              f"({(ratio - 1) * 100:+6.1f} %) {marker}")
+        if slower:
+            regressions.append((name, base['seconds'], result['seconds']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks auf einem synthetischen Projektkorpus")
+    parser.add_argument('--projects', type=int, default=10000,
+                        help="Anzahl erzeugter Projekte (bis 1000000; Standard: %(default)s)")
+    parser.add_argument('--seed', type=int, default=42, help="Seed des Generators")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Wiederholungen je wiederholbarer Messung, gewertet wird die schnellste")
+    parser.add_argument('--requests', type=int, default=20, help="Abrufe je Route aus dem Seiten-Cache")
+    parser.add_argument('--workers', type=int, default=pm.SCORING_WORKERS, help="Prozesse fürs Scoring")
+    parser.add_argument('--db', help="Datenbank behalten (Standard: temporär, wird gelöscht)")
+    parser.add_argument('--output', help="Ergebnis zusätzlich als JSON in diese Datei schreiben")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Baseline-Datei (Standard: %(default)s)")
+    parser.add_argument('--save-baseline', action='store_true', help="Ergebnis als Baseline speichern")
+    parser.add_argument('--compare', action='store_true', help="Gegen die Baseline prüfen")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Erlaubte Verlangsamung gegenüber der Baseline (Standard: %(default)s = 20 %%)")
+    args = parser.parse_args()
+
+    workdir = None
+    if args.db:
+        db_path = args.db
+        if os.path.exists(db_path):
+            sys.exit(f"{db_path} existiert bereits; der Benchmark braucht eine neue Datenbank")
+    else:
+        workdir = tempfile.mkdtemp(prefix='freelancermap-bench-')
+        db_path = os.path.join(workdir, 'benchmark.db')
+    # Der Webserver liest die Datenbank aus der Umgebung (vor dem Import setzen)
+    os.environ['FREELANCERMAP_DB'] = os.path.abspath(db_path)
+
+    print(f"Korpus: {args.projects} Projekte (Seed {args.seed}), Datenbank: {db_path}")
+    try:
+        results = Benchmark(db_path, args.projects, args.seed, args.repeat, args.requests,
+                            args.workers).run()
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'projects': args.projects,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'workers': args.workers,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'machine': platform.platform(),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+
+    status = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            sys.exit(f"Keine Baseline unter {args.baseline} (erst --save-baseline)")
+        with open(args.baseline, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        for key in ('projects', 'seed', 'workers'):
+            if baseline['meta'].get(key) != report['meta'][key]:
+                print(f"Warnung: Baseline mit {key}={baseline['meta'].get(key)}, jetzt {report['meta'][key]}")
+        print(f"\nVergleich mit {args.baseline} ({baseline['meta']['timestamp']}):")
+        regressions = compare(results, baseline['results'], args.tolerance)
+        print(f"\n{len(regressions)} Regression(en)" if regressions else "\nKeine Regression")
+        status = 1 if regressions else 0
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Baseline gespeichert: {args.baseline}")
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+End-to-End-Lasttest des Crawls gegen den lokalen Mock-Server.
+
+Startet mock_freelancermap im Hintergrund und lässt den echten Scraper (Login,
+Pipeline, Retries, Re-Login, Schreiben in eine temporäre Datenbank) für jede
+angegebene Parallelität einmal komplett crawlen. Gemessen werden Durchsatz und
+Vollständigkeit; Fehler, Retries und Session-Abläufe zählt der Mock-Server.
+
+    python3 loadtest.py --projects 2000 --concurrency 1 3 8 --latency 0.05
+    python3 loadtest.py --rate-429 0.05 --rate-5xx 0.02 --session-requests 20
+
+Exit-Code 1, wenn ein Lauf nicht alle Projekte gespeichert hat.
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+import projectMatcher as pm
+from mock_freelancermap import MockConfig, MockFreelancermap
+
+
+def crawl(base_url, config, concurrency, rate, db_path, verbose=False):
+    """
+    Ein vollständiger Crawl gegen den Mock-Server.
+
+    Returns:
+        dict: Laufzeit, gespeicherte Projekte, Seiten, Requests und Durchsatz
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if verbose else output):
+        db = pm.FreelancermapDatabase(db_path)
+    scraper = pm.FreelancermapScraper(
+        db, config.username, config.password,
+        max_pages=-(-config.projects // config.page_size) + 1,
+        concurrency=concurrency,
+        incremental=False,
+        rate_limiter=pm.RateLimiter(rate=rate, min_rate=min(rate, pm.MIN_REQUESTS_PER_SECOND),
+                                    max_rate=rate, burst=concurrency),
+        base_url=base_url,
+    )
+    try:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stdout if verbose else output):
+            stats = scraper.scrape()
+        seconds = time.perf_counter() - started
+        stored = db.conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+    finally:
+        db.close()
+    if stats is None:
+        raise RuntimeError(f"Login am Mock-Server fehlgeschlagen:\n{output.getvalue()}")
+    return {
+        'concurrency': concurrency,
+        'seconds': seconds,
+        'projects': stored,
+        'pages': stats['pages_processed'],
+        'failed_page': stats['failed_page'],
+        'requests': stats['requests'],
+        'projects_per_second': stored / seconds if seconds else None,
+        'stages': [stage.report() for stage in stats['stages']],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl-Lasttest gegen den lokalen Mock-Server")
+    parser.add_argument('--projects', type=int, default=1000, help="Projekte im Mock-Korpus")
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, pm.CONCURRENCY],
+                        help="Parallelitäten, die nacheinander gemessen werden")
+    parser.add_argument('--rate', type=float, default=50.0,
+                        help="Request-Budget des Scrapers je Sekunde (Standard: %(default)s)")
+    parser.add_argument('--latency', type=float, default=0.02, help="Antwortzeit des Servers in Sekunden")
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--rate-429', type=float, default=0.0, help="Anteil 429-Antworten der Suche")
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help="Anteil 5xx-Antworten der Suche")
+    parser.add_argument('--retry-after', type=float, default=0.2)
+    parser.add_argument('--session-requests', type=int, help="Session läuft nach N Suchanfragen ab")
+    parser.add_argument('--session-ttl', type=float, help="Session läuft nach N Sekunden ab")
+    parser.add_argument('--output', help="Ergebnis als JSON in diese Datei schreiben")
+    parser.add_argument('--verbose', action='store_true', help="Ausgaben des Scrapers anzeigen")
+    args = parser.parse_args()
+
+    config = MockConfig(args.projects, args.page_size, args.seed, latency=args.latency,
+                        jitter=args.jitter, rate_429=args.rate_429, rate_5xx=args.rate_5xx,
+                        retry_after=args.retry_after, session_requests=args.session_requests,
+                        session_ttl=args.session_ttl)
+    server = MockFreelancermap(config=config)
+    base_url = server.start()
+    print(f"Mock-Server: {base_url} ({config.projects} Projekte, {config.page_size} je Seite)")
+
+    workdir = tempfile.mkdtemp(prefix='freelancermap-load-')
+    runs = []
+    try:
+        for concurrency in args.concurrency:
+            before = server.snapshot()
+            result = crawl(base_url, config, concurrency, args.rate,
+                           os.path.join(workdir, f"crawl-{concurrency}.db"), args.verbose)
+            after = server.snapshot()
+            result['server'] = {key: after[key] - before[key] for key in after}
+            result['complete'] = result['failed_page'] is None and result['projects'] == config.projects
+            runs.append(result)
+
+            server_stats = result['server']
+            print(f"Parallelität {concurrency}: {result['projects']}/{config.projects} Projekte "
+                  f"in {result['seconds']:.2f}s ({result['projects_per_second']:.0f} Projekte/s), "
+                  f"{server_stats['requests']} Requests, {server_stats['status_429']}x 429, "
+                  f"{server_stats['status_5xx']}x 5xx, {server_stats['expired_sessions']} Session-Abläufe, "
+                  f"{server_stats['logins']} Logins" + ("" if result['complete'] else "  UNVOLLSTÄNDIG")
+                  + (f" (Seite {result['failed_page']} fehlgeschlagen)" if result['failed_page'] else ""))
+            for stage in result['stages']:
+                print(f"  {stage}")
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump({'config': vars(config), 'runs': runs}, fh, indent=2)
+    sys.exit(0 if all(run['complete'] for run in runs) else 1)
+
+
+if __name__ == '__main__':
+    main()
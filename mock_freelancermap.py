@@ -0,0 +1,277 @@
+"""
+Lokaler Ersatz für freelancermap.de, gegen den der Scraper offline läuft.
+
+Bildet Login-Formular, Account-Seite und die paginierte Projektsuche
+(/project/search/ajax) nach; Latenz, 429/5xx-Antworten und ablaufende Sessions
+sind einstellbar. Der Korpus stammt aus benchmark.generate_projects (Seed).
+
+    python3 mock_freelancermap.py --port 8765 --projects 2000 --latency 0.05 --rate-429 0.05
+    FREELANCERMAP_BASE_URL=http://127.0.0.1:8765 FREELANCERMAP_USERNAME=mock \\
+        FREELANCERMAP_PASSWORD=mock python3 projectMatcher.py
+
+GET /__stats liefert die Zähler des Servers als JSON.
+"""
+import json
+import time
+import random
+import secrets
+import argparse
+import threading
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmark import generate_projects
+
+SESSION_COOKIE = 'PHPSESSID'
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><body>
+<form method="post" action="/login">
+  <input name="login"><input name="password" type="password">
+  <input type="hidden" name="_remember_me" value="1">
+  <button>Anmelden</button>
+</form>
+</body></html>"""
+
+ACCOUNT_PAGE = """<!DOCTYPE html>
+<html><body><h1>Mein Konto</h1><a href="/logout">Abmelden</a></body></html>"""
+
+
+class MockConfig:
+    """Verhalten des Mock-Servers."""
+
+    def __init__(self, projects=1000, page_size=20, seed=42, username='mock', password='mock',
+                 latency=0.0, jitter=0.0, rate_429=0.0, rate_5xx=0.0, retry_after=0.2,
+                 session_requests=None, session_ttl=None):
+        """
+        Args:
+            projects (int): Anzahl Projekte im Korpus
+            page_size (int): Projekte je Suchseite
+            latency (float): Antwortverzögerung in Sekunden (plus bis zu `jitter`)
+            rate_429 (float): Anteil der Suchanfragen, die mit 429 (Retry-After) abgelehnt werden
+            rate_5xx (float): Anteil der Suchanfragen mit 500/502/503
+            retry_after (float): Retry-After bei 429/503 in Sekunden
+            session_requests (int): Session läuft nach so vielen Suchanfragen ab (None = nie)
+            session_ttl (float): Session läuft nach so vielen Sekunden ab (None = nie)
+        """
+        self.projects = projects
+        self.page_size = page_size
+        self.seed = seed
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.session_requests = session_requests
+        self.session_ttl = session_ttl
+
+
+class MockFreelancermap(ThreadingHTTPServer):
+    """HTTP-Server mit Korpus, Sessions und Zählern; Handler ist MockHandler."""
+
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), config=None):
+        super().__init__(address, MockHandler)
+        self.config = config or MockConfig()
+        # Die Suche ist nach Datum sortiert (neueste zuerst), wie auf der echten Seite
+        self.corpus = sorted(generate_projects(self.config.projects, self.config.seed),
+                             key=lambda project: project['created'], reverse=True)
+        self.sessions = {}
+        self.rng = random.Random(self.config.seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'search_requests': 0, 'pages_served': 0, 'logins': 0,
+                      'failed_logins': 0, 'expired_sessions': 0, 'status_429': 0, 'status_5xx': 0}
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Startet den Server in einem Hintergrund-Thread; gibt die Basis-URL zurück."""
+        self._thread = threading.Thread(target=self.serve_forever, name='mock-freelancermap', daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def new_session(self):
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.sessions[token] = {'created': time.monotonic(), 'requests': 0}
+            self.stats['logins'] += 1
+        return token
+
+    def use_session(self, token):
+        """Zählt eine Suchanfrage der Session; False, wenn sie unbekannt oder abgelaufen ist."""
+        config = self.config
+        with self.lock:
+            session = self.sessions.get(token)
+            if session is None:
+                return False
+            expired = ((config.session_requests is not None and session['requests'] >= config.session_requests)
+                       or (config.session_ttl is not None
+                           and time.monotonic() - session['created'] > config.session_ttl))
+            if expired:
+                del self.sessions[token]
+                self.stats['expired_sessions'] += 1
+                return False
+            session['requests'] += 1
+            return True
+
+    def fault(self):
+        """Gewürfelter Fehlerstatus für eine Suchanfrage (None = normale Antwort)."""
+        with self.lock:
+            roll = self.rng.random()
+            if roll < self.config.rate_429:
+                self.stats['status_429'] += 1
+                return 429
+            if roll < self.config.rate_429 + self.config.rate_5xx:
+                self.stats['status_5xx'] += 1
+                return self.rng.choice((500, 502, 503))
+        return None
+
+    def page(self, number):
+        size = self.config.page_size
+        start = (number - 1) * size
+        return self.corpus[start:start + size] if number >= 1 else []
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = 'MockFreelancermap/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _delay(self):
+        config = self.server.config
+        if config.latency or config.jitter:
+            time.sleep(config.latency + random.uniform(0, config.jitter))
+
+    def _send(self, status, body=b'', content_type='text/html; charset=utf-8', headers=None):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _redirect(self, location, headers=None):
+        self._send(302, headers={'Location': location, **(headers or {})})
+
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        return cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+
+    def do_GET(self):
+        self.server.count('requests')
+        self._delay()
+        url = urlsplit(self.path)
+        if url.path == '/login':
+            self._send(200, LOGIN_PAGE)
+        elif url.path == '/mein_account.html':
+            with self.server.lock:
+                known = self._session() in self.server.sessions
+            if known:
+                self._send(200, ACCOUNT_PAGE)
+            else:
+                self._redirect('/login')
+        elif url.path == '/project/search/ajax':
+            self._search(parse_qs(url.query))
+        elif url.path == '/__stats':
+            self._send(200, json.dumps(self.server.snapshot()), 'application/json')
+        else:
+            self._send(404, 'Not Found')
+
+    def do_POST(self):
+        self.server.count('requests')
+        self._delay()
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        if urlsplit(self.path).path != '/login':
+            self._send(404, 'Not Found')
+            return
+        config = self.server.config
+        if form.get('login', [''])[0] == config.username and form.get('password', [''])[0] == config.password:
+            token = self.server.new_session()
+            self._redirect('/mein_account.html',
+                           {'Set-Cookie': f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"})
+        else:
+            self.server.count('failed_logins')
+            self._send(200, LOGIN_PAGE)
+
+    def _search(self, query):
+        self.server.count('search_requests')
+        status = self.server.fault()
+        if status is not None:
+            headers = {}
+            if status in (429, 503):
+                headers['Retry-After'] = f"{self.server.config.retry_after:g}"
+            self._send(status, json.dumps({'error': status}), 'application/json', headers)
+            return
+        if not self.server.use_session(self._session()):
+            # So meldet die echte Suche eine abgelaufene Session
+            self._send(200, json.dumps({'redirect': '/login'}), 'application/json')
+            return
+        try:
+            number = int(query.get('pagenr', ['1'])[0])
+        except ValueError:
+            number = 1
+        projects = self.server.page(number)
+        if projects:
+            self.server.count('pages_served')
+        self._send(200, json.dumps({'projects': projects}), 'application/json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokaler Mock-Server für freelancermap.de")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--projects', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--username', default='mock')
+    parser.add_argument('--password', default='mock')
+    parser.add_argument('--latency', type=float, default=0.0, help="Sekunden je Antwort")
+    parser.add_argument('--jitter', type=float, default=0.0, help="zusätzliche zufällige Sekunden")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="Anteil 429-Antworten der Suche")
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help="Anteil 5xx-Antworten der Suche")
+    parser.add_argument('--retry-after', type=float, default=0.2)
+    parser.add_argument('--session-requests', type=int, help="Session läuft nach N Suchanfragen ab")
+    parser.add_argument('--session-ttl', type=float, help="Session läuft nach N Sekunden ab")
+    args = parser.parse_args()
+
+    config = MockConfig(args.projects, args.page_size, args.seed, args.username, args.password,
+                        args.latency, args.jitter, args.rate_429, args.rate_5xx, args.retry_after,
+                        args.session_requests, args.session_ttl)
+    server = MockFreelancermap((args.host, args.port), config)
+    print(f"Mock-Server: {server.url} ({config.projects} Projekte, {config.page_size} je Seite)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,38 @@
 import sqlite3
-from datetime import datetime
+import re
+from datetime import datetime, timezone
+from html import unescape
+from html.entities import html5
 import requests
 from bs4 import BeautifulSoup
 import time
 import random
 import math
+import threading
+import json
+import gzip
+import zlib
+import csv
+import io
+import hashlib
+import argparse
+import queue
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv
 import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # Batch-Scoring ist optional
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet-Export ist optional
+    pa = pq = None
 
 load_dotenv()
 
@@ -14,12 +40,53 @@ load_dotenv()
 # Credentials
 FREELANCERMAP_USERNAME = os.getenv('FREELANCERMAP_USERNAME')
 FREELANCERMAP_PASSWORD = os.getenv('FREELANCERMAP_PASSWORD')
+# Andere Basis-URL z.B. für den lokalen Mock-Server (mock_freelancermap.py)
+FREELANCERMAP_BASE_URL = os.getenv('FREELANCERMAP_BASE_URL', 'https://www.freelancermap.de')
 
 # Scraping Settings
 MAX_PAGES = 10
 MIN_SCORE = 40
+CONCURRENCY = 3          # Seiten, die gleichzeitig abgerufen werden
+INCREMENTAL = True       # Abbrechen, sobald eine Seite nur bekannte Projekte enthält
+
+# Rate Limiting
+REQUESTS_PER_SECOND = 1.0       # Start-Budget, wird adaptiv angepasst
+MIN_REQUESTS_PER_SECOND = 0.1
+MAX_REQUESTS_PER_SECOND = 4.0
+MAX_RETRIES = 4                 # Wiederholungen bei 429/5xx und Verbindungsfehlern
+BACKOFF_BASE = 2.0              # Sekunden, verdoppelt sich pro Versuch
+BACKOFF_MAX = 60.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Session-Cookies zwischen Läufen wiederverwenden (None = immer neu einloggen)
+COOKIE_FILE = 'freelancermap_cookies.json'
+
+# Kapazität der Queues zwischen Fetch-, Parse- und Schreib-Stufe (Seiten)
+PIPELINE_QUEUE_SIZE = 2
+
+# HTML-zu-Text für Beschreibungen: 'fast' (mit BeautifulSoup-Fallback) oder 'bs4'
+DESCRIPTION_PARSER = 'fast'
+
+# Rohantworten der Projektsuche für Offline-Replays aufbewahren (None = aus)
+RESPONSE_CACHE_DIR = 'response_cache'
 
 # Profile Settings
+# Bei Änderungen am Scoring erhöhen: erzwingt ein vollständiges Neu-Scoring
+SCORING_VERSION = 1
+
+# Ab dieser Anzahl Projekte wird mit numpy im Batch gescort (falls installiert)
+BATCH_SCORING_MIN_ROWS = 500
+# Batch-Scores knapp unter min_score werden zeilenweise nachgerechnet (Rundungsfehler)
+BATCH_SCORE_TOLERANCE = 1e-6
+
+# Prozesse für das Neu-Scoring großer Bestände (1 = im Hauptprozess)
+SCORING_WORKERS = 1
+# Ab dieser Anzahl Projekte lohnt der Start des Prozess-Pools
+PARALLEL_SCORING_MIN_ROWS = 5000
+
+# Optional: mehrere Profile als JSON {"name": {skills, preferred_keywords, excluded_keywords}}
+PROFILES_FILE = 'profiles.json'
+
 PROFILE = {
     'skills': [
         'Python', 'JavaScript', 'React', 'Vue', 'MySQL', 
@@ -33,17 +100,418 @@ PROFILE = {
     'excluded_keywords': ['SAP', 'Drupal']
 }
 
+# Wörterbuch, gegen das beim Import Keywords extrahiert werden (Profilbegriffe kommen hinzu)
+SKILL_DICTIONARY = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'PHP', 'Ruby', 'Go', 'Golang', 'Rust',
+    'C#', 'C++', 'Kotlin', 'Swift', 'Scala', 'SQL', 'MySQL', 'PostgreSQL', 'MongoDB',
+    'Redis', 'Oracle', 'Elasticsearch', 'HTML', 'CSS', 'Sass', 'React', 'Angular', 'Vue',
+    'Vue.js', 'Node.js', 'Next.js', 'Django', 'Flask', 'FastAPI', 'Spring', 'Laravel',
+    'Symfony', 'WordPress', 'Drupal', 'TYPO3', 'Shopware', 'Magento', '.NET', 'ASP.NET',
+    'AWS', 'Azure', 'GCP', 'Cloud', 'Docker', 'Kubernetes', 'Terraform', 'Ansible',
+    'Linux', 'Git', 'CI/CD', 'Jenkins', 'DevOps', 'REST', 'GraphQL', 'API', 'Microservices',
+    'Frontend', 'Backend', 'Fullstack', 'Webentwicklung', 'Webdesign', 'UX', 'UI',
+    'AI', 'KI', 'Machine Learning', 'OpenAI', 'LLM', 'Data Science', 'Pandas', 'Spark',
+    'Kafka', 'SAP', 'ABAP', 'Salesforce', 'Scrum', 'Jira', 'Android', 'iOS', 'Flutter',
+]
+
+
+def load_profiles(path=PROFILES_FILE):
+    """Lädt alle Profile aus `path`; ohne Datei gilt nur PROFILE als 'default'."""
+    if not path or not os.path.exists(path):
+        return {'default': PROFILE}
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def skill_terms(profiles=None):
+    """Skill-Wörterbuch für die Extraktion: SKILL_DICTIONARY plus alle Profilbegriffe."""
+    profiles = load_profiles() if profiles is None else profiles
+    terms = list(SKILL_DICTIONARY)
+    for profile in profiles.values():
+        terms += profile['skills'] + profile['preferred_keywords']
+    return terms
+
+
+class RateLimiter:
+    """
+    Thread-sicherer Token-Bucket, den alle Requests eines Scrapers teilen.
+
+    Die Rate wird bei 429/5xx und deutlich langsameren Antworten multiplikativ
+    gesenkt und bei gesunden Antworten schrittweise wieder angehoben.
+    """
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, min_rate=MIN_REQUESTS_PER_SECOND,
+                 max_rate=MAX_REQUESTS_PER_SECOND, burst=1):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._latency = None
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Blockiert, bis ein Request gesendet werden darf."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Halbiert die Rate und pausiert alle Worker.
+
+        Args:
+            attempt (int): Nummer des fehlgeschlagenen Versuchs (0-basiert)
+            retry_after (float): Wartezeit aus dem Retry-After-Header, falls vorhanden
+
+        Returns:
+            float: Wartezeit in Sekunden
+        """
+        if retry_after is None:
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+        else:
+            delay = min(BACKOFF_MAX, retry_after)
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        return delay
+
+    def record_success(self, latency):
+        """Passt die Rate anhand der Antwortzeit eines erfolgreichen Requests an."""
+        with self._lock:
+            if self._latency is None:
+                self._latency = latency
+            if latency > max(2 * self._latency, 1.0):
+                self.rate = max(self.min_rate, self.rate * 0.8)
+            else:
+                self.rate = min(self.max_rate, self.rate + 0.1)
+            self._latency = 0.8 * self._latency + 0.2 * latency
+
+
+def parse_retry_after(value):
+    """Wandelt einen Retry-After-Header (Sekunden oder HTTP-Datum) in Sekunden um."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+
+
+class ResponseCache:
+    """
+    Inhaltsadressierter Ablageort für Rohantworten der Projektsuche.
+
+    Jede Antwort wird gzip-komprimiert unter ihrem SHA-256 abgelegt
+    (objects/ab/abcd....json.gz); identische Antworten werden nur einmal
+    gespeichert. index.jsonl hält pro Abruf URL, Zeitpunkt und Hash fest.
+    """
+
+    def __init__(self, cache_dir=RESPONSE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, 'index.jsonl')
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(cache_dir, 'objects'), exist_ok=True)
+
+    def _object_path(self, digest):
+        return os.path.join(self.cache_dir, 'objects', digest[:2], f"{digest}.json.gz")
+
+    def store(self, url, body, fetched_at=None):
+        """
+        Speichert eine Rohantwort.
+
+        Args:
+            url (str): abgerufene URL
+            body (bytes): unveränderter Response-Body
+            fetched_at (str): Abrufzeitpunkt (Standard: jetzt)
+
+        Returns:
+            str: SHA-256 des Bodys
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        entry = {
+            'url': url,
+            'fetched_at': fetched_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'sha256': digest,
+        }
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with gzip.open(tmp_path, 'wb') as fh:
+                    fh.write(body)
+                os.replace(tmp_path, path)
+            with open(self.index_path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps(entry) + "\n")
+        return digest
+
+    def load(self, digest):
+        with gzip.open(self._object_path(digest), 'rb') as fh:
+            return fh.read()
+
+    def entries(self, since=None):
+        """Liefert die Index-Einträge in Abrufreihenfolge, optional ab `since`."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, encoding='utf-8') as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if since and entry['fetched_at'] < since:
+                    continue
+                yield entry
+
+
+class DescriptionCleaner:
+    """
+    Wandelt HTML-Beschreibungen in Text um, identisch zu
+    BeautifulSoup(html, 'html.parser').get_text(separator=' ', strip=True).
+
+    Der schnelle Pfad zerlegt wohlgeformtes Markup per Regex an den Tags und
+    baut keinen Baum auf. Kommentare, Elemente mit Rohtext-Inhalt (<script>,
+    <style>, ab Python 3.14 auch <textarea>, <title> u.a.), lose '<' sowie
+    unbekannte oder unvollständige Entities gehen an BeautifulSoup.
+    """
+
+    _TAG_RE = re.compile(
+        r"""</?[a-zA-Z][a-zA-Z0-9:-]*"""
+        r"""(?:\s+[^\s"'<>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?)*\s*/?>"""
+    )
+    _UNSAFE_RE = re.compile(
+        r"<[!?]|<(?:script|style|textarea|title|xmp|iframe|noembed|noframes|noscript|plaintext)\b",
+        re.IGNORECASE,
+    )
+    _ENTITY_RE = re.compile(r"&(?:#[0-9]+;|#[xX][0-9a-fA-F]+;|([a-zA-Z][a-zA-Z0-9]*;))?")
+
+    # Fester Abgleichskorpus für --benchmark-cleaner (zusätzlich zu benchmark.generate_projects)
+    EDGE_CASES = (
+        "<p>Python &amp; Django</p>",
+        "<p>AT&amp;T &amp Co</p>",
+        "<p>R&D, Q&A und C&amp;C</p>",
+        "<p>&copy 2025 &copy; &nbsp;Firma&nbsp;</p>",
+        "<p>&#8211; &#x2013; &#X2014; &#65;&#66;</p>",
+        "<p>&unbekannt; &ndash; &hellip;</p>",
+        "Zeile 1<br/>Zeile 2<br>Zeile 3<br />Zeile 4",
+        "<p class=\"a>b\">Attribut mit &gt;</p>",
+        "<img alt='x > y' src=\"bild.png\"/>Text nach Bild",
+        "<a href=\"/p?a=1&amp;b=2\" title=\"&quot;zitat&quot;\">Link</a>",
+        "<P>Großbuchstaben</P><DIV>Block</DIV>",
+        "<ul><li>Eins</li><li>Zwei</li></ul>",
+        "  <p>\n  Leerraum  \n</p>\n\t<p>\tTabs\t</p>  ",
+        "<p>a < b und b > a</p>",
+        "<p>unvollständig <b",
+        "<p>Kommentar<!-- <b>versteckt</b> --> danach</p>",
+        "<!DOCTYPE html><p>Doctype</p>",
+        "<?php echo 1; ?><p>Processing Instruction</p>",
+        "<p>vor</p><script>var x = '<b>';</script><p>nach</p>",
+        "<style>p > b { color: red; }</style><p>Stil</p>",
+        "<textarea><b>Rohtext</b></textarea><p>Formular</p>",
+        "<title>Titel &amp; <i>Markup</i></title><p>Seite</p>",
+        "<xmp><b>xmp</b></xmp><iframe><b>iframe</b></iframe>",
+        "<noembed><b>noembed</b></noembed><noframes><b>noframes</b></noframes>",
+        "<noscript><b>noscript</b></noscript><plaintext><b>plaintext</b>",
+        "<p>Emoji 🚀 und Umlaute äöü ß</p>",
+        "",
+        "Nur Text ohne Markup",
+    )
+
+    def __init__(self, mode=DESCRIPTION_PARSER):
+        if mode not in ('fast', 'bs4'):
+            raise ValueError(f"Unbekannter Beschreibungs-Parser: {mode}")
+        self.mode = mode
+        self.fast_count = 0
+        self.fallback_count = 0
+
+    def clean(self, html):
+        if self.mode == 'fast':
+            text = self.fast_text(html)
+            if text is not None:
+                self.fast_count += 1
+                return text
+        self.fallback_count += 1
+        return self.bs4_text(html)
+
+    @staticmethod
+    def bs4_text(html):
+        return BeautifulSoup(html, 'html.parser').get_text(separator=' ', strip=True)
+
+    @classmethod
+    def fast_text(cls, html):
+        """Text aus einfachem Markup oder None, wenn BeautifulSoup nötig ist."""
+        if cls._UNSAFE_RE.search(html):
+            return None
+        texts = []
+        for part in cls._TAG_RE.split(html):
+            if '<' in part:
+                return None
+            if '&' in part:
+                for entity in cls._ENTITY_RE.finditer(part):
+                    if entity.group(0) == '&' or (entity.group(1) and entity.group(1) not in html5):
+                        return None
+                part = unescape(part)
+            part = part.strip()
+            if part:
+                texts.append(part)
+        return ' '.join(texts)
+
+    @classmethod
+    def compare(cls, descriptions):
+        """
+        Prüft den schnellen Pfad gegen BeautifulSoup und misst beide.
+
+        Args:
+            descriptions (iterable): HTML-Beschreibungen
+
+        Returns:
+            dict: Anzahl, Fallbacks, Abweichungen und Laufzeit je Pfad
+        """
+        result = {'samples': 0, 'fallbacks': 0, 'mismatches': [], 'fast_seconds': 0.0, 'bs4_seconds': 0.0}
+        for html in descriptions:
+            result['samples'] += 1
+            started = time.perf_counter()
+            fast = cls.fast_text(html)
+            result['fast_seconds'] += time.perf_counter() - started
+            started = time.perf_counter()
+            reference = cls.bs4_text(html)
+            result['bs4_seconds'] += time.perf_counter() - started
+            if fast is None:
+                result['fallbacks'] += 1
+            elif fast != reference:
+                result['mismatches'].append(html)
+        return result
+
+
+_PIPELINE_DONE = object()
+# Ergebnis von fetch_page_data, wenn eine Seite trotz Retries und Re-Login nicht geladen
+# werden konnte (im Unterschied zu einer leeren letzten Seite)
+FETCH_FAILED = object()
+
+
+class PageGate:
+    """
+    Hält im inkrementellen Crawl den Abruf der nächsten Seite zurück, bis die
+    Schreib-Stufe die vorige verarbeitet hat. Sobald eine Seite neue Projekte
+    enthielt, wird geöffnet und mit voller Parallelität weitergeladen.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._stored = 0
+        self.is_open = False
+        self._closed = False
+
+    def wait(self, page):
+        """Wartet, bis `page` abgerufen werden darf; False, wenn der Crawl endet."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.is_open or self._closed or self._stored >= page - 1)
+            return not self._closed
+
+    def stored(self, page, widen=False):
+        with self._cond:
+            self._stored = max(self._stored, page)
+            self.is_open = self.is_open or widen
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class StageStats:
+    """Durchsatz einer Pipeline-Stufe: aktive Zeit und Wartezeit auf volle Queues."""
+
+    def __init__(self, name):
+        self.name = name
+        self.pages = 0
+        self.projects = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+
+    def record(self, seconds, projects):
+        self.pages += 1
+        self.projects += projects
+        self.busy += seconds
+
+    def put(self, target, item):
+        """Reicht `item` weiter und misst, wie lange die Stufe dabei blockiert."""
+        started = time.monotonic()
+        target.put(item)
+        self.blocked += time.monotonic() - started
+
+    def report(self):
+        rate = self.projects / self.busy if self.busy else 0.0
+        return (f"{self.name}: {self.pages} Seiten, {self.projects} Projekte, "
+                f"{self.busy:.2f}s aktiv ({rate:.1f} Projekte/s), {self.blocked:.2f}s blockiert")
+
 
 class FreelancermapDatabase:
-    def __init__(self, db_path="freelancermap.db"):
+    def __init__(self, db_path="freelancermap.db", terms=None):
+        """
+        Args:
+            db_path (str): Pfad der SQLite-Datenbank
+            terms (list): Skill-Wörterbuch für die Extraktion (Standard: skill_terms())
+        """
+        self.db_path = db_path
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = sqlite3.Row
+        # WAL: Leser (Webserver) blockieren den Scraper nicht; NORMAL genügt im WAL-Modus
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
         self.create_tables()
+        # Bereits indexierte Begriffe bleiben im Wörterbuch, sonst veraltet der Index
+        terms = skill_terms() if terms is None else list(terms)
+        self.skill_extractor = SkillExtractor(terms + sorted(self.indexed_skill_terms()))
+        with self.conn:
+            self._cover_skill_terms()
 
     def close(self):
         self.conn.close()
         
+    # Schema-Migrationen in Reihenfolge; PRAGMA user_version zählt die angewandten.
+    # Jede Migration ist idempotent, ein abgebrochenes Upgrade kann wiederholt werden.
+    MIGRATIONS = [
+        '_migrate_base_schema',
+        '_migrate_indexes',
+        '_migrate_keyset_index',
+        '_migrate_statistics_rollups',
+        '_migrate_match_explanations',
+        '_migrate_normalize_matches',
+    ]
+
     def create_tables(self):
+        """Bringt das Schema (auch bestehender Datenbanken) per Migrationen auf den aktuellen Stand."""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, migration in enumerate(self.MIGRATIONS[version:], start=version + 1):
+            print(f"Datenbank-Migration {number}: {migration}")
+            getattr(self, migration)()
+            self.conn.execute(f"PRAGMA user_version = {number}")
+            self.conn.commit()
+
+    def _migrate_base_schema(self):
+        """Ausgangsschema; Datenbanken ohne user_version wurden schon teilweise so angelegt."""
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS projects (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -55,9 +523,13 @@ class FreelancermapDatabase:
                 created_date DATETIME,
                 is_top_project BOOLEAN,
                 is_endcustomer BOOLEAN,
-                scrape_date DATETIME DEFAULT CURRENT_TIMESTAMP
+                scrape_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+                content_hash TEXT,
+                updated_date DATETIME
             )
         """)
+        self._ensure_column('projects', 'content_hash', 'TEXT')
+        self._ensure_column('projects', 'updated_date', 'DATETIME')
         
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS matches (
@@ -77,10 +549,780 @@ class FreelancermapDatabase:
                 FOREIGN KEY(project_id) REFERENCES projects(id)
             )
         """)
+
+        self._ensure_column('matches', 'profile_hash', 'TEXT')
+
+        # Profil-Versionen: Hash über Profil, min_score und SCORING_VERSION
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS match_profiles (
+                profile_hash TEXT PRIMARY KEY,
+                name TEXT,
+                profile TEXT,
+                min_score FLOAT,
+                last_run DATETIME
+            )
+        """)
+
+        # Altbestand ohne Profil-Hash: pro Projekt nur das jüngste Match behalten
+        self.conn.execute("""
+            DELETE FROM matches
+            WHERE profile_hash IS NULL
+              AND id NOT IN (
+                  SELECT MAX(id) FROM matches WHERE profile_hash IS NULL GROUP BY project_id
+              )
+        """)
+        self.conn.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_matches_project_profile
+            ON matches(project_id, profile_hash)
+        """)
+
+        # Extrahierte Skills je Projekt (kleingeschrieben, Teilstring-Treffer)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS project_skills (
+                project_id INTEGER NOT NULL REFERENCES projects(id),
+                skill TEXT NOT NULL,
+                PRIMARY KEY (project_id, skill)
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_project_skills_skill
+            ON project_skills(skill, project_id)
+        """)
+        # Begriffe, die project_skills für alle Projekte abdeckt (gepflegt von
+        # _cover_skill_terms beim Import und von index_skills)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS skill_terms (
+                skill TEXT PRIMARY KEY
+            )
+        """)
+
+        self._create_fts()
+
+        # High-Water-Mark je Suchkonfiguration für inkrementelle Crawls
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_state (
+                search_key TEXT PRIMARY KEY,
+                newest_link TEXT,
+                newest_created_date DATETIME,
+                last_crawl DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def _migrate_indexes(self):
+        """Indizes für die Zugriffe von Webserver und Matching."""
+        self.conn.executescript("""
+            -- Match-Liste (Sortierung nach Score), Score-Verteilung, Top-Firmen
+            CREATE INDEX IF NOT EXISTS idx_matches_profile_score
+            ON matches(profile_hash, match_score, project_id);
+
+            -- Übersicht der letzten 7 Tage
+            CREATE INDEX IF NOT EXISTS idx_matches_profile_date
+            ON matches(profile_hash, match_date, match_score, project_id);
+
+            -- Kandidaten fürs Matching: Projekte der letzten 30 Tage bzw. seit dem letzten Lauf
+            CREATE INDEX IF NOT EXISTS idx_projects_created
+            ON projects(created_date);
+            CREATE INDEX IF NOT EXISTS idx_projects_changed
+            ON projects(COALESCE(updated_date, scrape_date));
+
+            -- Neueste Profil-Version (je Name)
+            CREATE INDEX IF NOT EXISTS idx_match_profiles_name_run
+            ON match_profiles(name, last_run);
+            CREATE INDEX IF NOT EXISTS idx_match_profiles_run
+            ON match_profiles(last_run);
+        """)
+
+    def _create_fts(self):
+        """
+        Volltextindex (FTS5) über Titel, Firma und Beschreibung der Projekte.
+
+        Der Index liest den Text aus `projects` (external content) und wird per
+        Trigger synchron gehalten; beim ersten Anlegen wird der Bestand indexiert.
+        Präfix-Indizes (2 und 3 Zeichen) beschleunigen die Präfixsuche; `rank`
+        gewichtet Treffer im Titel vor Firma vor Beschreibung (bm25).
+        """
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'"
+        ).fetchone()
+        try:
+            self.conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+                    title, company, description,
+                    content='projects', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            print(f"Volltextsuche nicht verfügbar (SQLite ohne FTS5): {e}")
+            return
+
+        self.conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN
+                INSERT INTO projects_fts (rowid, title, company, description)
+                VALUES (new.id, new.title, new.company, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN
+                INSERT INTO projects_fts (projects_fts, rowid, title, company, description)
+                VALUES ('delete', old.id, old.title, old.company, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS projects_fts_update
+            AFTER UPDATE OF title, company, description ON projects BEGIN
+                INSERT INTO projects_fts (projects_fts, rowid, title, company, description)
+                VALUES ('delete', old.id, old.title, old.company, old.description);
+                INSERT INTO projects_fts (rowid, title, company, description)
+                VALUES (new.id, new.title, new.company, new.description);
+            END;
+        """)
+        if not exists:
+            self.conn.execute(
+                "INSERT INTO projects_fts (projects_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')"
+            )
+            self.conn.execute("INSERT INTO projects_fts (projects_fts) VALUES ('rebuild')")
+
+    def _migrate_keyset_index(self):
+        """Match-Liste blättert per Keyset über (match_score, id) statt per OFFSET."""
+        self.conn.executescript("""
+            DROP INDEX IF EXISTS idx_matches_profile_score;
+            CREATE INDEX IF NOT EXISTS idx_matches_profile_score_id
+            ON matches(profile_hash, match_score, id, project_id);
+        """)
+
+    def _migrate_statistics_rollups(self):
+        """Vorberechnete Statistiken je Profil-Version, befüllt für den Bestand."""
+        self.conn.executescript("""
+            -- Übersicht nach Match-Tag, damit das 7-Tage-Fenster ohne Neuberechnung weiterwandert
+            CREATE TABLE IF NOT EXISTS match_stats_daily (
+                profile_hash TEXT,
+                day DATE,
+                match_count INTEGER,
+                score_sum FLOAT,
+                latest_match DATETIME,
+                oldest_project DATETIME,
+                PRIMARY KEY (profile_hash, day)
+            );
+            CREATE TABLE IF NOT EXISTS match_stats_company_daily (
+                profile_hash TEXT,
+                day DATE,
+                company TEXT,
+                PRIMARY KEY (profile_hash, day, company)
+            );
+            CREATE TABLE IF NOT EXISTS match_stats_histogram (
+                profile_hash TEXT,
+                score_range TEXT,
+                match_count INTEGER,
+                PRIMARY KEY (profile_hash, score_range)
+            );
+            CREATE TABLE IF NOT EXISTS match_stats_company (
+                profile_hash TEXT,
+                company TEXT,
+                match_count INTEGER,
+                score_sum FLOAT,
+                PRIMARY KEY (profile_hash, company)
+            );
+            CREATE INDEX IF NOT EXISTS idx_match_stats_company_count
+            ON match_stats_company(profile_hash, match_count);
+        """)
+        for row in self.conn.execute("SELECT DISTINCT profile_hash FROM matches").fetchall():
+            self.refresh_statistics(row['profile_hash'])
+
+    def _migrate_match_explanations(self):
+        """
+        Ersetzt den Text match_debug durch kompakte Score-Bestandteile (match_explain).
+        Bestehende Matches erhalten sie beim nächsten Scoring; bis dahin erzeugt die
+        Detailseite die Erklärung aus dem Profil.
+        """
+        self._ensure_column('matches', 'match_explain', 'TEXT')
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(matches)")}
+        if 'match_debug' in columns:
+            if sqlite3.sqlite_version_info >= (3, 35, 0):
+                self.conn.execute("ALTER TABLE matches DROP COLUMN match_debug")
+            else:
+                self.conn.execute("UPDATE matches SET match_debug = NULL")
+
+    def _migrate_normalize_matches(self):
+        """
+        matches enthält nur noch die Scoring-Fakten; Titel, Firma, Beschreibung usw.
+        kommen per Join aus projects. Die Tabelle wird neu aufgebaut: je Projekt und
+        Profil-Version bleibt das jüngste Match, Matches ohne Projekt entfallen.
+        """
+        total = self.conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+        # Ein Skript in einer Transaktion: ein Abbruch lässt die alte Tabelle stehen
+        self.conn.executescript("""
+            BEGIN;
+            CREATE TABLE matches_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_id INTEGER NOT NULL REFERENCES projects(id),
+                profile_hash TEXT,
+                match_score FLOAT,
+                match_explain TEXT,
+                match_date DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+            INSERT INTO matches_new (id, project_id, profile_hash, match_score, match_explain, match_date)
+            SELECT m.id, m.project_id, m.profile_hash, m.match_score, m.match_explain, m.match_date
+            FROM matches m
+            JOIN projects p ON p.id = m.project_id
+            WHERE m.id IN (SELECT MAX(id) FROM matches GROUP BY project_id, profile_hash);
+            DROP TABLE matches;
+            ALTER TABLE matches_new RENAME TO matches;
+            CREATE UNIQUE INDEX idx_matches_project_profile
+            ON matches(project_id, profile_hash);
+            CREATE INDEX idx_matches_profile_score_id
+            ON matches(profile_hash, match_score, id, project_id);
+            CREATE INDEX idx_matches_profile_date
+            ON matches(profile_hash, match_date, match_score, project_id);
+            COMMIT;
+        """)
+        moved = self.conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+        if total > moved:
+            print(f"  {total - moved} doppelte bzw. verwaiste Matches entfernt")
+        if total:
+            print("  Freien Platz zurückgewinnen: python3 projectMatcher.py --compact")
+
+    def database_size(self, include_wal=True):
+        """Größe der Datenbankdatei in Bytes, standardmäßig inkl. WAL."""
+        suffixes = ('', '-wal') if include_wal else ('',)
+        return sum(os.path.getsize(self.db_path + suffix)
+                   for suffix in suffixes if os.path.exists(self.db_path + suffix))
+
+    def compact(self, incremental=False):
+        """
+        Gibt freie Seiten an das Dateisystem zurück.
+
+        Ein volles VACUUM baut die Datei neu auf und stellt auf auto_vacuum=INCREMENTAL
+        um; danach genügt incremental=True, das nur die Freelist kürzt (schnell, ohne
+        Kopie der Datenbank).
+
+        Returns:
+            dict: Größe vorher/nachher in Bytes (Datenbankdatei allein und inkl. WAL)
+                  sowie freie Seiten vorher/nachher
+        """
+        self.conn.commit()
+        before = self.database_size()
+        before_file = self.database_size(include_wal=False)
+        free_pages = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        auto_vacuum = self.conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if incremental and auto_vacuum == 2:
+            # Gibt je Schritt eine Seite frei; execute() macht nur einen Schritt (das
+            # Pragma liefert keine Spalten), executescript() läuft bis zum Ende
+            self.conn.executescript("PRAGMA incremental_vacuum")
+        else:
+            self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self.conn.execute("VACUUM")
+        # Der WAL enthält nach dem VACUUM die ganze Datenbank ein zweites Mal
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {'before': before, 'after': self.database_size(),
+                'before_file': before_file, 'after_file': self.database_size(include_wal=False),
+                'free_pages': free_pages,
+                'free_pages_after': self.conn.execute("PRAGMA freelist_count").fetchone()[0],
+                'mode': 'incremental' if incremental and auto_vacuum == 2 else 'vacuum'}
+
+    def refresh_statistics(self, profile_hash):
+        """
+        Berechnet die Statistik-Rollups einer Profil-Version aus `matches` neu.
+        Läuft in der Transaktion des Aufrufers (siehe ProjectMatcher._write_matches).
+        """
+        for table in ('match_stats_daily', 'match_stats_company_daily',
+                      'match_stats_histogram', 'match_stats_company'):
+            self.conn.execute(f"DELETE FROM {table} WHERE profile_hash IS ?", (profile_hash,))
+
+        self.conn.execute("""
+            INSERT INTO match_stats_daily
+                (profile_hash, day, match_count, score_sum, latest_match, oldest_project)
+            SELECT m.profile_hash, date(m.match_date), COUNT(*), SUM(m.match_score),
+                   MAX(m.match_date), MIN(p.created_date)
+            FROM matches m
+            JOIN projects p ON m.project_id = p.id
+            WHERE m.profile_hash IS ?
+            GROUP BY date(m.match_date)
+        """, (profile_hash,))
+        self.conn.execute("""
+            INSERT INTO match_stats_company_daily (profile_hash, day, company)
+            SELECT DISTINCT m.profile_hash, date(m.match_date), p.company
+            FROM matches m
+            JOIN projects p ON m.project_id = p.id
+            WHERE m.profile_hash IS ?
+              AND p.company IS NOT NULL
+        """, (profile_hash,))
+        self.conn.execute(f"""
+            INSERT INTO match_stats_histogram (profile_hash, score_range, match_count)
+            SELECT profile_hash, {SCORE_RANGE_SQL} as score_range, COUNT(*)
+            FROM matches
+            WHERE profile_hash IS ?
+            GROUP BY score_range
+        """, (profile_hash,))
+        self.conn.execute("""
+            INSERT INTO match_stats_company (profile_hash, company, match_count, score_sum)
+            SELECT m.profile_hash, p.company, COUNT(*), SUM(m.match_score)
+            FROM matches m
+            JOIN projects p ON m.project_id = p.id
+            WHERE p.company != 'N/A'
+              AND m.profile_hash IS ?
+            GROUP BY p.company
+        """, (profile_hash,))
+
+    def _ensure_column(self, table, column, definition):
+        """Ergänzt eine Spalte in bestehenden Datenbanken."""
+        columns = {row['name'] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _select_by_links(self, columns, links, chunk_size=500):
+        links = list(links)
+        for i in range(0, len(links), chunk_size):
+            chunk = links[i:i + chunk_size]
+            placeholders = ", ".join("?" * len(chunk))
+            yield from self.conn.execute(
+                f"SELECT {columns} FROM projects WHERE link IN ({placeholders})", chunk
+            )
+
+    @staticmethod
+    def content_hash(project):
+        """Hash über alle gescrapten Felder außer dem Link."""
+        content = json.dumps([
+            project['titel'], project['firma'], project['beschreibung'], project['keywords'],
+            project['eintragungsdatum'], bool(project['ist_top_projekt']),
+            bool(project['ist_endkundenprojekt']),
+        ], ensure_ascii=False)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def upsert_projects(self, projects):
+        """
+        Schreibt eine Seite Projekte in einer Transaktion. Neue Links werden
+        eingefügt, bekannte nur aktualisiert, wenn sich ihr Inhalt geändert hat.
+
+        Returns:
+            dict: inserted/updated/unchanged und die IDs der neuen oder geänderten Projekte
+        """
+        rows = {}
+        for project in projects:
+            rows[project['link']] = (
+                project['titel'],
+                project['firma'],
+                project['beschreibung'],
+                project['keywords'],
+                project['eintragungsdatum'],
+                project['ist_top_projekt'],
+                project['ist_endkundenprojekt'],
+                self.content_hash(project),
+                project['link'],
+            )
+
+        existing = {row['link']: row['content_hash']
+                    for row in self._select_by_links('link, content_hash', rows)}
+        inserts = [row for link, row in rows.items() if link not in existing]
+        updates = [row for link, row in rows.items() if link in existing and existing[link] != row[7]]
+
+        changed = {row[8]: row for row in inserts + updates}
+        with self.conn:
+            self._cover_skill_terms()
+            self.conn.executemany("""
+                INSERT OR IGNORE INTO projects
+                (title, company, description, keywords, created_date,
+                is_top_project, is_endcustomer, content_hash, link, updated_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, inserts)
+            self.conn.executemany("""
+                UPDATE projects SET
+                    title = ?, company = ?, description = ?, keywords = ?, created_date = ?,
+                    is_top_project = ?, is_endcustomer = ?, content_hash = ?,
+                    updated_date = CURRENT_TIMESTAMP
+                WHERE link = ?
+            """, updates)
+
+            changed_ids, skills = [], []
+            for row in self._select_by_links('id, link', changed):
+                title, _, description = changed[row['link']][:3]
+                changed_ids.append(row['id'])
+                skills.extend((row['id'], term)
+                              for term in self.skill_extractor.terms(title, description))
+            self._replace_project_skills(changed_ids, skills)
+
+        return {
+            'inserted': len(inserts),
+            'updated': len(updates),
+            'unchanged': len(rows) - len(inserts) - len(updates),
+            'changed_ids': changed_ids,
+        }
+
+    def _replace_project_skills(self, project_ids, skills):
+        self.conn.executemany("DELETE FROM project_skills WHERE project_id = ?",
+                              [(project_id,) for project_id in project_ids])
+        self.conn.executemany("INSERT OR IGNORE INTO project_skills (project_id, skill) VALUES (?, ?)",
+                              skills)
+
+    def _cover_skill_terms(self):
+        """
+        Ohne Projekte ist project_skills für jeden Begriff des Extraktors vollständig.
+        Jedes danach importierte Projekt wird mit demselben (um skill_terms erweiterten)
+        Extraktor indexiert, die Abdeckung bleibt also erhalten. Läuft in der
+        Transaktion des Aufrufers.
+        """
+        if self.conn.execute("SELECT 1 FROM projects LIMIT 1").fetchone() is None:
+            self.conn.executemany("INSERT OR IGNORE INTO skill_terms (skill) VALUES (?)",
+                                  [(term,) for term in self.skill_extractor.names])
+
+    def indexed_skill_terms(self):
+        """Begriffe, für die project_skills vollständig ist (Voraussetzung fürs Vorfiltern)."""
+        return {row['skill'] for row in self.conn.execute("SELECT skill FROM skill_terms")}
+
+    def index_skills(self, batch_size=1000):
+        """
+        Extrahiert Keywords und project_skills für alle Projekte neu, etwa für
+        Altbestände oder nach einer Erweiterung des Wörterbuchs. Projekte mit
+        geänderten Keywords bekommen ein neues updated_date und werden beim
+        nächsten Matching neu gescort.
+
+        Returns:
+            dict: Anzahl indexierter Projekte und Projekte mit geänderten Keywords
+        """
+        stats = {'projects': 0, 'updated': 0}
+        last_id = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT * FROM projects WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+            ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+
+            updates, skills = [], []
+            for row in rows:
+                keywords = ', '.join(self.skill_extractor.keywords(row['title'], row['description'])) or 'N/A'
+                skills.extend((row['id'], term)
+                              for term in self.skill_extractor.terms(row['title'], row['description']))
+                if keywords != row['keywords']:
+                    content_hash = self.content_hash({
+                        'titel': row['title'], 'firma': row['company'],
+                        'beschreibung': row['description'], 'keywords': keywords,
+                        'eintragungsdatum': row['created_date'],
+                        'ist_top_projekt': row['is_top_project'],
+                        'ist_endkundenprojekt': row['is_endcustomer'],
+                    })
+                    updates.append((keywords, content_hash, row['id']))
+
+            with self.conn:
+                self.conn.executemany("""
+                    UPDATE projects SET keywords = ?, content_hash = ?, updated_date = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, updates)
+                self._replace_project_skills([row['id'] for row in rows], skills)
+            stats['projects'] += len(rows)
+            stats['updated'] += len(updates)
+
+        with self.conn:
+            self.conn.execute("DELETE FROM skill_terms")
+            self.conn.executemany("INSERT INTO skill_terms (skill) VALUES (?)",
+                                  [(term,) for term in self.skill_extractor.names])
+        return stats
+
+    def current_profile_hash(self, name=None):
+        """Hash der zuletzt gematchten Profil-Version (optional je Profilname)."""
+        if name is None:
+            row = self.conn.execute(
+                "SELECT profile_hash FROM match_profiles ORDER BY last_run DESC LIMIT 1"
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT profile_hash FROM match_profiles WHERE name = ? ORDER BY last_run DESC LIMIT 1",
+                (name,)
+            ).fetchone()
+        return row['profile_hash'] if row else None
+
+    def get_crawl_state(self, search_key):
+        cur = self.conn.execute(
+            "SELECT * FROM crawl_state WHERE search_key = ?", (search_key,)
+        )
+        row = cur.fetchone()
+        return dict(row) if row else None
+
+    def save_crawl_state(self, search_key, newest_link, newest_created_date):
+        self.conn.execute("""
+            INSERT INTO crawl_state (search_key, newest_link, newest_created_date, last_crawl)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(search_key) DO UPDATE SET
+                newest_link = excluded.newest_link,
+                newest_created_date = excluded.newest_created_date,
+                last_crawl = excluded.last_crawl
+        """, (search_key, newest_link, newest_created_date))
         self.conn.commit()
 
+SCORE_RANGE_SQL = """
+    CASE
+        WHEN match_score < 30 THEN '0-30'
+        WHEN match_score BETWEEN 30 AND 50 THEN '30-50'
+        WHEN match_score BETWEEN 50 AND 70 THEN '50-70'
+        ELSE '70-100'
+    END"""
+SCORE_RANGES = ['0-30', '30-50', '50-70', '70-100']
+
+
+def read_statistics(conn, profile_hash):
+    """
+    Statistik einer Profil-Version aus den Rollup-Tabellen (siehe refresh_statistics).
+
+    Returns:
+        dict: overview (letzte 7 Tage), distribution (Score-Bereiche), top_companies (Top 10)
+    """
+    overview = dict(conn.execute("""
+        SELECT
+            SUM(score_sum) / SUM(match_count) as avg_score,
+            COALESCE(SUM(match_count), 0) as total_matches,
+            MAX(latest_match) as latest_match,
+            MIN(oldest_project) as oldest_project
+        FROM match_stats_daily
+        WHERE profile_hash IS ?
+          AND day >= date('now', '-7 days')
+    """, (profile_hash,)).fetchone())
+    overview['unique_companies'] = conn.execute("""
+        SELECT COUNT(DISTINCT company) FROM match_stats_company_daily
+        WHERE profile_hash IS ?
+          AND day >= date('now', '-7 days')
+    """, (profile_hash,)).fetchone()[0]
+
+    counts = dict(conn.execute(
+        "SELECT score_range, match_count FROM match_stats_histogram WHERE profile_hash IS ?",
+        (profile_hash,)
+    ).fetchall())
+    distribution = [{'score_range': score_range, 'count': counts[score_range]}
+                    for score_range in SCORE_RANGES if score_range in counts]
+
+    top_companies = [dict(row) for row in conn.execute("""
+        SELECT company, match_count as project_count, score_sum / match_count as avg_match_score
+        FROM match_stats_company
+        WHERE profile_hash IS ?
+        ORDER BY match_count DESC
+        LIMIT 10
+    """, (profile_hash,))]
+    return {'overview': overview, 'distribution': distribution, 'top_companies': top_companies}
+
+
+def live_statistics(conn, profile_hash):
+    """Dieselbe Statistik wie read_statistics(), direkt aus matches aggregiert (für Abgleiche)."""
+    overview = dict(conn.execute("""
+        SELECT
+            AVG(m.match_score) as avg_score,
+            COUNT(*) as total_matches,
+            MAX(m.match_date) as latest_match,
+            MIN(p.created_date) as oldest_project,
+            COUNT(DISTINCT p.company) as unique_companies
+        FROM matches m
+        JOIN projects p ON m.project_id = p.id
+        WHERE m.match_date >= date('now', '-7 days')
+          AND m.profile_hash IS ?
+    """, (profile_hash,)).fetchone())
+    counts = dict(conn.execute(f"""
+        SELECT {SCORE_RANGE_SQL} as score_range, COUNT(*) as count
+        FROM matches
+        WHERE profile_hash IS ?
+        GROUP BY score_range
+    """, (profile_hash,)).fetchall())
+    distribution = [{'score_range': score_range, 'count': counts[score_range]}
+                    for score_range in SCORE_RANGES if score_range in counts]
+    companies = [dict(row) for row in conn.execute("""
+        SELECT
+            p.company,
+            COUNT(*) as project_count,
+            AVG(m.match_score) as avg_match_score
+        FROM matches m
+        JOIN projects p ON m.project_id = p.id
+        WHERE p.company != 'N/A'
+          AND m.profile_hash IS ?
+        GROUP BY p.company
+    """, (profile_hash,))]
+    return {'overview': overview, 'distribution': distribution, 'companies': companies}
+
+
+def verify_statistics(conn, profile_hash, tolerance=1e-6):
+    """
+    Vergleicht die Rollups einer Profil-Version mit den Live-Aggregaten.
+
+    Returns:
+        list: Beschreibung jeder Abweichung (leer, wenn alles übereinstimmt)
+    """
+    rollup = read_statistics(conn, profile_hash)
+    live = live_statistics(conn, profile_hash)
+    differences = []
+
+    def same(a, b):
+        if isinstance(a, float) or isinstance(b, float):
+            return a is not None and b is not None and abs(a - b) <= tolerance
+        return a == b
+
+    for key, value in live['overview'].items():
+        if not same(rollup['overview'][key], value):
+            differences.append(f"overview.{key}: Rollup {rollup['overview'][key]!r}, live {value!r}")
+    if rollup['distribution'] != live['distribution']:
+        differences.append(f"distribution: Rollup {rollup['distribution']}, live {live['distribution']}")
+
+    rollup_companies = {row['company']: row for row in conn.execute("""
+        SELECT company, match_count as project_count, score_sum / match_count as avg_match_score
+        FROM match_stats_company WHERE profile_hash IS ?
+    """, (profile_hash,))}
+    for row in live['companies']:
+        other = rollup_companies.pop(row['company'], None)
+        if other is None or other['project_count'] != row['project_count'] \
+                or not same(other['avg_match_score'], row['avg_match_score']):
+            differences.append(f"company {row['company']!r}: Rollup {dict(other) if other else None}, live {row}")
+    for company in rollup_companies:
+        differences.append(f"company {company!r}: nur im Rollup")
+    return differences
+
+
+# Exportformate -> MIME-Typ
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+# Zeilen je gelesenem Block bzw. Parquet-Row-Group
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = ['title', 'company', 'keywords', 'description', 'created_date', 'link',
+                  'is_top_project', 'is_endcustomer', 'match_score', 'match_explain']
+EXPORT_FLAGS = {'is_top_project', 'is_endcustomer'}
+
+
+def export_formats():
+    """Verfügbare Exportformate (Parquet nur mit pyarrow)."""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or pa is not None]
+
+
+def export_filename(stem, fmt='csv', compress=False):
+    """Dateiname eines Exports; Parquet komprimiert intern statt per .gz."""
+    return f"{stem}.{fmt}" + ('.gz' if compress and fmt != 'parquet' else '')
+
+
+def export_batches(conn, profile_hash, min_score=30, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Matches einer Profil-Version (bester Score zuerst) in Blöcken von `batch_size`
+    Zeilen. Die Reihenfolge folgt idx_matches_profile_score_id, SQLite sortiert also
+    nichts zwischen und der Speicherbedarf bleibt unabhängig von der Trefferzahl.
+    """
+    cur = conn.execute("""
+        SELECT
+            p.title, p.company, p.keywords, p.description,
+            p.created_date, p.link, p.is_top_project,
+            p.is_endcustomer, m.match_score, m.match_explain
+        FROM matches m
+        JOIN projects p ON m.project_id = p.id
+        WHERE m.match_score >= ?
+          AND m.profile_hash IS ?
+        ORDER BY m.match_score DESC, m.id DESC
+    """, (min_score, profile_hash))
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _csv_chunks(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=';')
+    buffer.write('\ufeff')  # BOM wie bisher (utf-8-sig), damit Excel UTF-8 erkennt
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _export_record(row):
+    return {column: (bool(value) if column in EXPORT_FLAGS and value is not None else value)
+            for column, value in zip(EXPORT_COLUMNS, row)}
+
+
+def _jsonl_chunks(batches):
+    for rows in batches:
+        yield ''.join(json.dumps(_export_record(row), ensure_ascii=False) + '\n'
+                      for row in rows).encode('utf-8')
+
+
+class _ChunkSink:
+    """Schreibziel für pyarrow, das Geschriebenes zum Weiterreichen sammelt statt es zu behalten."""
+
+    closed = False
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+
+def _parquet_chunks(batches, compression):
+    if pa is None:
+        raise RuntimeError("Parquet-Export benötigt pyarrow (pip install pyarrow)")
+    schema = pa.schema([(column, pa.bool_() if column in EXPORT_FLAGS
+                         else pa.float64() if column == 'match_score' else pa.string())
+                        for column in EXPORT_COLUMNS])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for rows in batches:
+            records = [_export_record(row) for row in rows]
+            writer.write_table(pa.Table.from_pylist(records, schema=schema))
+            yield sink.take()
+    yield sink.take()
+
+
+def iter_export(conn, profile_hash, min_score=30, fmt='csv', compress=False,
+                batch_size=EXPORT_BATCH_SIZE):
+    """
+    Exportiert die Matches einer Profil-Version als Folge von Byte-Blöcken.
+
+    CSV (Trennzeichen `;`) und JSONL werden bei `compress` als gzip-Stream
+    ausgegeben, Parquet (eine Row-Group je Block) komprimiert intern mit gzip
+    statt snappy. Es liegt nie mehr als ein Block im Speicher.
+
+    Args:
+        conn: SQLite-Verbindung
+        profile_hash (str): Profil-Version
+        fmt (str): 'csv', 'jsonl' oder 'parquet' (siehe EXPORT_FORMATS)
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unbekanntes Exportformat: {fmt}")
+    batches = export_batches(conn, profile_hash, min_score, batch_size)
+    if fmt == 'parquet':
+        yield from _parquet_chunks(batches, 'gzip' if compress else 'snappy')
+        return
+
+    chunks = _csv_chunks(batches) if fmt == 'csv' else _jsonl_chunks(batches)
+    if not compress:
+        yield from chunks
+        return
+    compressor = zlib.compressobj(wbits=31)  # wbits=31: gzip-Container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 class FreelancermapScraper:
-    def __init__(self, db, username, password, max_pages=2):
+    def __init__(self, db, username, password, max_pages=2, concurrency=1, incremental=False,
+                 rate_limiter=None, cookie_file=None, response_cache=None, description_cleaner=None,
+                 base_url=None):
         self.db = db
         """
         Initialisiert den Scraper mit Login-Daten
@@ -89,13 +1331,34 @@ class FreelancermapScraper:
             username (str): Benutzername für freelancermap.de
             password (str): Passwort für freelancermap.de
             max_pages (int): Anzahl der zu scrapenden Seiten
+            concurrency (int): Anzahl gleichzeitig abgerufener Seiten
+            incremental (bool): Crawl beenden, sobald eine Seite nur bekannte Projekte enthält
+            rate_limiter (RateLimiter): gemeinsames Request-Budget (Standard: eigenes)
+            cookie_file (str): Datei, in der die Session-Cookies gespeichert werden
+            response_cache (ResponseCache): Ablage für Rohantworten (optional)
+            description_cleaner (DescriptionCleaner): HTML-zu-Text (Standard: DESCRIPTION_PARSER)
+            base_url (str): Basis-URL der Seite (Standard: FREELANCERMAP_BASE_URL)
         """
-        self.base_url = "https://www.freelancermap.de"
+        self.base_url = (base_url or FREELANCERMAP_BASE_URL).rstrip('/')
         self.login_url = f"{self.base_url}/login"
         self.username = username
         self.password = password
         self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.incremental = incremental
+        self.pages_requested = 0
+        self.failed_page = None
         self.session = requests.Session()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.cookie_file = cookie_file
+        self.response_cache = response_cache
+        self.description_cleaner = description_cleaner or DescriptionCleaner(DESCRIPTION_PARSER)
+        self._stats_lock = threading.Lock()
+
+        # Re-Login ist single-flight: die Generation zählt erfolgte Logins
+        self._login_lock = threading.Lock()
+        self._login_generation = 0
+        self._login_ok = False
         
         # Basis-Headers für alle Requests
         self.headers = {
@@ -115,23 +1378,124 @@ class FreelancermapScraper:
             'Cache-Control': 'no-cache'
     }
 
-    def login(self):
+    def _request(self, method, url, **kwargs):
+        """
+        Sendet einen Request über die Session unter Einhaltung des Rate-Limits.
+
+        Bei 429/5xx und Verbindungsfehlern wird mit exponentiellem Backoff
+        (bzw. Retry-After) bis zu MAX_RETRIES-mal wiederholt.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = self.rate_limiter.backoff(attempt)
+                print(f"Verbindungsfehler ({e}), neuer Versuch in {delay:.1f}s")
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                delay = self.rate_limiter.backoff(attempt, retry_after)
+                print(f"Status {response.status_code}, neuer Versuch in {delay:.1f}s "
+                      f"({attempt + 1}/{MAX_RETRIES})")
+                continue
+
+            # Nach dem letzten Versuch kommt 429/5xx zurück, zählt aber nicht als gesund
+            if response.status_code not in RETRY_STATUS_CODES:
+                self.rate_limiter.record_success(time.monotonic() - started)
+            return response
+
+    def load_cookies(self):
+        """
+        Lädt gespeicherte Session-Cookies in die Session.
+
+        Returns:
+            bool: True, wenn noch gültige Cookies geladen wurden
+        """
+        if not self.cookie_file or not os.path.exists(self.cookie_file):
+            return False
         try:
-            print("Starte Login-Prozess...")
+            with open(self.cookie_file, encoding='utf-8') as fh:
+                cookies = json.load(fh)
+        except (OSError, ValueError) as e:
+            print(f"Cookie-Datei konnte nicht gelesen werden: {e}")
+            return False
 
-            # Erst die Login-Seite abrufen
-            print("Lade Login-Seite...")
-            self.session.get(
-                self.login_url,
-                headers=self.headers
+        now = time.time()
+        loaded = 0
+        for cookie in cookies:
+            if cookie.get('expires') and cookie['expires'] < now:
+                continue
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/'),
+                expires=cookie.get('expires'),
+                secure=cookie.get('secure', False),
             )
-            
-            # Login-spezifische Headers
+            loaded += 1
+        return loaded > 0
+
+    def save_cookies(self):
+        if not self.cookie_file:
+            return
+        cookies = [{
+            'name': cookie.name,
+            'value': cookie.value,
+            'domain': cookie.domain,
+            'path': cookie.path,
+            'expires': cookie.expires,
+            'secure': cookie.secure,
+        } for cookie in self.session.cookies]
+        fd = os.open(self.cookie_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            json.dump(cookies, fh)
+
+    def ensure_session(self):
+        """Verwendet gespeicherte Cookies oder führt einen Login durch."""
+        if self.load_cookies():
+            print("Verwende gespeicherte Session-Cookies.")
+            self._login_ok = True
+            return True
+        self._login_ok = self.login()
+        return self._login_ok
+
+    def _relogin(self, generation):
+        """
+        Loggt nach abgelaufener Session neu ein. Parallele Abrufe, die denselben
+        Ablauf bemerken, warten auf den ersten Login statt selbst einzuloggen.
+
+        Args:
+            generation (int): Login-Generation, mit der der fehlgeschlagene Request lief
+        """
+        with self._login_lock:
+            if self._login_generation == generation:
+                self._login_ok = self.login()
+                self._login_generation += 1
+            return self._login_ok
+
+    def login(self):
+        try:
+            print("Starte Login-Prozess...")
+
+            # Erst die Login-Seite abrufen
+            print("Lade Login-Seite...")
+            self._request(
+                'GET',
+                self.login_url,
+                headers=self.headers
+            )
+            
+            # Login-spezifische Headers
             login_headers = self.headers.copy()
             login_headers.update({
                 'Content-Type': 'application/x-www-form-urlencoded',
-                'Referer': 'https://www.freelancermap.de/login',
-                'Origin': 'https://www.freelancermap.de',
+                'Referer': self.login_url,
+                'Origin': self.base_url,
             })
             
             login_data = {
@@ -141,7 +1505,8 @@ class FreelancermapScraper:
             }
             
             print("Führe Login durch...")
-            login_response = self.session.post(
+            login_response = self._request(
+                'POST',
                 self.login_url,
                 data=login_data,
                 headers=login_headers,
@@ -156,19 +1521,18 @@ class FreelancermapScraper:
                 print(f"- {cookie.name}: {cookie.value}")
                 
             if login_response.status_code in [200, 302]:
-                time.sleep(2)
-                
                 print("\nPrüfe Account-Seite...")
                 
                 # Account-Seite mit aktualisierten Headers abrufen
                 account_headers = self.headers.copy()
                 account_headers.update({
-                    'Referer': 'https://www.freelancermap.de/login',
+                    'Referer': self.login_url,
                     'Cache-Control': 'max-age=0'
                 })
                 
-                account_page = self.session.get(
-                    'https://www.freelancermap.de/mein_account.html',
+                account_page = self._request(
+                    'GET',
+                    f"{self.base_url}/mein_account.html",
                     headers=account_headers
                 )
                 
@@ -177,6 +1541,7 @@ class FreelancermapScraper:
                 if account_page.status_code == 200:
                     if any(indicator in account_page.text for indicator in ['Mein Konto', 'Profil', 'Logout', 'Abmelden']):
                         print("Login erfolgreich!")
+                        self.save_cookies()
                         return True
                     else:
                         print("Login fehlgeschlagen: Keine Login-Indikatoren gefunden")
@@ -189,7 +1554,8 @@ class FreelancermapScraper:
             print(f"Fehler beim Login: {str(e)}")
             return False
 
-    def get_page_url(self, page_number):
+    def get_search_key(self):
+        """Identifiziert die Suchkonfiguration (alle Parameter außer der Seitennummer)."""
         params = [
             "contractTypes[]=contracting",
             "remoteInPercent[]=100",
@@ -197,12 +1563,23 @@ class FreelancermapScraper:
             "countries[]=2",
             "countries[]=3",
             "sort=1",
-            f"pagenr={page_number}"
         ]
-        return f"{self.base_url}/project/search/ajax?{'&'.join(params)}"
+        return '&'.join(params)
 
-    def get_page(self, page_number):
-        import json as json_lib
+    def get_page_url(self, page_number):
+        return f"{self.base_url}/project/search/ajax?{self.get_search_key()}&pagenr={page_number}"
+
+    def fetch_page_data(self, page_number):
+        """
+        Lädt die JSON-Rohdaten einer Suchseite.
+
+        Läuft die Session ab, wird neu eingeloggt und erneut abgerufen, bis zu
+        MAX_RETRIES-mal. Die Login-Generation wird bei jedem Versuch neu gelesen:
+        hat ein paralleler Abruf inzwischen eingeloggt, wird nur wiederholt.
+
+        Returns:
+            JSON-Rohdaten oder FETCH_FAILED, wenn die Seite nicht geladen werden konnte
+        """
         url = self.get_page_url(page_number)
         print(f"\nAbrufen von Seite {page_number}")
         print(f"URL: {url}")
@@ -213,43 +1590,53 @@ class FreelancermapScraper:
                 'Accept': 'application/json, text/javascript, */*; q=0.01',
                 'X-Requested-With': 'XMLHttpRequest',
             })
-            response = self.session.get(url, headers=ajax_headers)
-            print(f"Status Code: {response.status_code}")
+            for attempt in range(MAX_RETRIES + 1):
+                generation = self._login_generation
+                response = self._request('GET', url, headers=ajax_headers)
+                print(f"Status Code: {response.status_code}")
 
-            if response.status_code != 200:
-                print(f"Fehler: Status Code {response.status_code}")
-                return []
+                if response.status_code != 200:
+                    print(f"Fehler: Status Code {response.status_code}")
+                    return FETCH_FAILED
 
-            data = response.json()
+                data = response.json()
 
-            # Login abgelaufen
-            if isinstance(data, dict) and data.get('redirect'):
-                print("Login-Session abgelaufen, versuche erneuten Login...")
-                if self.login():
-                    return self.get_page(page_number)
-                return []
+                # Login abgelaufen
+                if isinstance(data, dict) and data.get('redirect'):
+                    print("Login-Session abgelaufen, versuche erneuten Login...")
+                    if attempt < MAX_RETRIES and self._relogin(generation):
+                        continue
+                    return FETCH_FAILED
 
-            projects = data if isinstance(data, list) else data.get('projects', data.get('hits', []))
+                if self.response_cache:
+                    self.response_cache.store(url, response.content)
 
-            if not projects:
-                print("Keine Projekte auf dieser Seite gefunden.")
-                return []
-
-            print(f"Gefundene Projekte: {len(projects)}")
-            project_data = []
-            for project in projects:
-                parsed = self._parse_project_json(project)
-                if parsed:
-                    project_data.append(parsed)
-                    print(f"Extrahiert: {parsed.get('titel', '')[:60]}...")
-
-            return project_data
+                print(f"Gefundene Projekte: {len(self._page_items(data))}")
+                return data
 
         except Exception as e:
             import traceback
             print(f"Fehler beim Laden der Seite {page_number}: {str(e)}")
             print(traceback.format_exc())
-            return []
+        return FETCH_FAILED
+
+    def get_page(self, page_number):
+        data = self.fetch_page_data(page_number)
+        return self.parse_page(data) if data is not FETCH_FAILED else []
+
+    @staticmethod
+    def _page_items(data):
+        return data if isinstance(data, list) else data.get('projects', data.get('hits', []))
+
+    def parse_page(self, data):
+        """Wandelt die JSON-Antwort einer Suchseite in Projekt-Dicts um."""
+        project_data = []
+        for project in self._page_items(data):
+            parsed = self._parse_project_json(project)
+            if parsed:
+                project_data.append(parsed)
+
+        return project_data
 
     def _parse_project_json(self, project):
         try:
@@ -261,13 +1648,12 @@ class FreelancermapScraper:
 
             desc_html = project.get('description', '')
             if desc_html:
-                desc_soup = BeautifulSoup(desc_html, 'html.parser')
-                description = desc_soup.get_text(separator=' ', strip=True)
+                description = self.description_cleaner.clean(desc_html)
             else:
                 description = 'N/A'
 
-            # API liefert keine Keywords — wir extrahieren sie aus der Beschreibung
-            keywords = 'N/A'
+            # API liefert keine Keywords — wir extrahieren sie aus Titel und Beschreibung
+            keywords = ', '.join(self.db.skill_extractor.keywords(title, description)) or 'N/A'
 
             created_raw = project.get('created', '')
             try:
@@ -293,142 +1679,530 @@ class FreelancermapScraper:
             print(f"Fehler beim Parsen eines Projekts: {str(e)}")
             return None
     
-    def scrape(self):
-            if not self.login():
-                return
-                
-            for page in range(1, self.max_pages + 1):
-                projects = self.get_page(page)
-                if not projects:
+    def _count_page_request(self, page_number):
+        with self._stats_lock:
+            self.pages_requested += 1
+        return self.fetch_page_data(page_number)
+
+    def iter_pages(self, gate=None):
+        """
+        Ruft die Seiten 1..max_pages mit bis zu `concurrency` parallelen Requests
+        über die gemeinsame Session ab und liefert (page, data) mit den JSON-Rohdaten
+        in Seitenreihenfolge. Bei der ersten leeren Seite wird abgebrochen, noch nicht
+        gestartete Abrufe werden verworfen.
+
+        Schlägt ein Abruf fehl, endet der Crawl ebenfalls; die Seite steht dann
+        in `failed_page`, damit er nicht als vollständig gilt.
+
+        Args:
+            gate (PageGate): solange geschlossen, wird jede Seite erst nach dem
+                Speichern der vorigen abgerufen
+        """
+        self.failed_page = None
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            pending = {}
+            next_page = 1
+            try:
+                for page in range(1, self.max_pages + 1):
+                    while next_page <= self.max_pages and len(pending) < self.concurrency:
+                        if gate is not None and not gate.is_open:
+                            if pending:
+                                break
+                            if not gate.wait(next_page):
+                                return
+                        pending[next_page] = pool.submit(self._count_page_request, next_page)
+                        next_page += 1
+
+                    data = pending.pop(page).result()
+                    if data is FETCH_FAILED:
+                        print(f"Seite {page} konnte nicht geladen werden, Crawl wird abgebrochen.")
+                        self.failed_page = page
+                        break
+                    if not data or not self._page_items(data):
+                        print(f"Keine Projekte auf Seite {page} gefunden.")
+                        break
+                    yield page, data
+            finally:
+                for future in pending.values():
+                    future.cancel()
+
+    def _run_pipeline(self, source, store, gate=None):
+        """
+        Verbindet Fetch-, Parse- und Schreib-Stufe über begrenzte Queues.
+
+        Fetch (liest `source`) und Parse laufen in eigenen Threads, geschrieben wird
+        im aufrufenden Thread, da die SQLite-Verbindung an ihn gebunden ist. Volle
+        Queues bremsen die vorgelagerte Stufe, der Speicherbedarf bleibt daher
+        unabhängig von max_pages konstant.
+
+        Args:
+            source: Iterator über (page, data) mit den JSON-Rohdaten
+            store: Callable(page, projects) -> bool; False beendet den Lauf vorzeitig
+            gate (PageGate): wird beim Abbruch geschlossen, damit `source` nicht weiter wartet
+
+        Returns:
+            list[StageStats]: Durchsatz je Stufe
+        """
+        fetch_stats, parse_stats, store_stats = StageStats('Fetch'), StageStats('Parse'), StageStats('Store')
+        parse_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        store_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        stop = threading.Event()
+        errors = []
+
+        def halt():
+            stop.set()
+            if gate is not None:
+                gate.close()
+
+        def fetch_stage():
+            try:
+                pages = iter(source)
+                while not stop.is_set():
+                    started = time.monotonic()
+                    try:
+                        page, data = next(pages)
+                    except StopIteration:
+                        break
+                    fetch_stats.record(time.monotonic() - started, len(self._page_items(data)))
+                    fetch_stats.put(parse_queue, (page, data))
+            except Exception as e:
+                errors.append(e)
+                halt()
+            finally:
+                if hasattr(source, 'close'):
+                    source.close()
+                parse_queue.put(_PIPELINE_DONE)
+
+        def parse_stage():
+            try:
+                while True:
+                    item = parse_queue.get()
+                    if item is _PIPELINE_DONE:
+                        break
+                    if stop.is_set():
+                        continue
+                    page, data = item
+                    started = time.monotonic()
+                    projects = self.parse_page(data)
+                    parse_stats.record(time.monotonic() - started, len(projects))
+                    parse_stats.put(store_queue, (page, projects))
+            except Exception as e:
+                errors.append(e)
+                halt()
+                # Queue weiter leeren, damit die Fetch-Stufe nicht blockiert
+                while parse_queue.get() is not _PIPELINE_DONE:
+                    pass
+            finally:
+                store_queue.put(_PIPELINE_DONE)
+
+        threads = [threading.Thread(target=fetch_stage, name='fetch', daemon=True),
+                   threading.Thread(target=parse_stage, name='parse', daemon=True)]
+        for thread in threads:
+            thread.start()
+
+        drained = False
+        try:
+            while True:
+                item = store_queue.get()
+                if item is _PIPELINE_DONE:
+                    drained = True
                     break
-                    
+                if stop.is_set():
+                    continue
+                page, projects = item
+                started = time.monotonic()
+                if not store(page, projects):
+                    halt()
+                store_stats.record(time.monotonic() - started, len(projects))
+        finally:
+            if not drained:
+                # Fehler beim Schreiben: vorgelagerte Stufen auslaufen lassen
+                halt()
+                while store_queue.get() is not _PIPELINE_DONE:
+                    pass
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+
+        stages = [fetch_stats, parse_stats, store_stats]
+        for stage in stages:
+            print(stage.report())
+        return stages
+
+    @staticmethod
+    def _add_write_stats(stats, result):
+        for key in ('inserted', 'updated', 'unchanged'):
+            stats[key] += result[key]
+        stats['changed_ids'].extend(result['changed_ids'])
+
+    @staticmethod
+    def _print_write_stats(stats):
+        print(f"Projekte neu: {stats['inserted']}, geändert: {stats['updated']}, "
+              f"unverändert: {stats['unchanged']}")
+
+    def replay(self, since=None):
+        """
+        Baut die Projekte offline aus dem Response-Cache neu auf: jede gespeicherte
+        Antwort durchläuft erneut Parse- und Schreib-Stufe, ohne Netzwerkzugriff.
+
+        Args:
+            since (str): nur Abrufe ab diesem Zeitpunkt ('YYYY-MM-DD HH:MM:SS')
+
+        Returns:
+            dict: Anzahl abgespielter Antworten und Projekte
+        """
+        if not self.response_cache:
+            raise ValueError("Replay benötigt einen Response-Cache")
+
+        def cached_pages():
+            # Nur direkt wiederholte Antworten einer URL überspringen: A -> B -> A muss
+            # wieder bei A enden, sonst weicht das Ergebnis vom Live-Lauf ab
+            last = {}
+            replayed = 0
+            for entry in self.response_cache.entries(since=since):
+                if last.get(entry['url']) == entry['sha256']:
+                    continue
+                last[entry['url']] = entry['sha256']
+                replayed += 1
+                yield replayed, json.loads(self.response_cache.load(entry['sha256']))
+
+        stats = {'responses': 0, 'projects': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0,
+                 'changed_ids': []}
+
+        def store(page, projects):
+            self._add_write_stats(stats, self.db.upsert_projects(projects))
+            stats['responses'] += 1
+            stats['projects'] += len(projects)
+            return True
+
+        stats['stages'] = self._run_pipeline(cached_pages(), store)
+        print(f"Replay: {stats['responses']} Antworten, {stats['projects']} Projekte")
+        self._print_write_stats(stats)
+        return stats
+
+    @staticmethod
+    def _is_crawl_date(value):
+        """True für Datumswerte im gespeicherten Format '%Y-%m-%d %H:%M:%S'."""
+        try:
+            datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+            return True
+        except (TypeError, ValueError):
+            return False
+
+    def scrape(self):
+            """
+            Scrapt bis zu max_pages Seiten und speichert neue Projekte.
+
+            Im inkrementellen Modus endet der Crawl nach der ersten Seite, die nur
+            bereits bekannte Links enthält (die Suche ist nach Datum sortiert). Bis
+            eine Seite neue Projekte liefert, wird dabei Seite für Seite geladen, ein
+            Lauf ohne Neuigkeiten kostet so nur einen Request.
+
+            Returns:
+                dict: Seiten-/Request-Statistik des Laufs oder None bei Login-Fehler
+            """
+            if not self.ensure_session():
+                return None
+
+            search_key = self.get_search_key()
+            state = self.db.get_crawl_state(search_key)
+            if self.incremental and state:
+                print(f"High-Water-Mark: {state['newest_created_date']} ({state['newest_link']})")
+
+            self.pages_requested = 0
+            progress = {'pages_processed': 0, 'newest': None}
+            written = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'changed_ids': []}
+            gate = PageGate() if self.incremental else None
+
+            def store(page, projects):
+                progress['pages_processed'] = page
                 for project in projects:
-                    self.db.conn.execute("""
-                        INSERT OR IGNORE INTO projects 
-                        (title, link, company, description, keywords, 
-                        created_date, is_top_project, is_endcustomer)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        project['titel'],
-                        project['link'],
-                        project['firma'],
-                        project['beschreibung'],
-                        project['keywords'],
-                        project['eintragungsdatum'],
-                        project['ist_top_projekt'],
-                        project['ist_endkundenprojekt']
-                    ))
-                self.db.conn.commit()
-                
-                if page < self.max_pages:
-                    time.sleep(random.uniform(2, 4))
+                    newest = progress['newest']
+                    # Nicht parsebare Daten ('N/A') würden als String über jedem Datum stehen
+                    if self._is_crawl_date(project['eintragungsdatum']) and (
+                            newest is None or project['eintragungsdatum'] > newest['eintragungsdatum']):
+                        progress['newest'] = project
 
-class ProjectMatcher:
-    def __init__(self, db):
-        self.db = db
-        
-    def find_matches(self, profile, min_score=30):
-        cur = self.db.conn.execute("""
-            SELECT * FROM projects
-            WHERE created_date >= date('now', '-30 days')
-        """)
-        projects = cur.fetchall()
+                result = self.db.upsert_projects(projects)
+                self._add_write_stats(written, result)
+                if gate is not None:
+                    gate.stored(page, widen=result['inserted'] > 0)
 
-        matches = []
-        for row in projects:
-            score, debug = self.calculate_match_score(row, profile)
-            if score >= min_score:
-                matches.append({
-                    'project_id': row['id'],
-                    'title': row['title'],
-                    'link': row['link'],
-                    'company': row['company'],
-                    'description': row['description'],
-                    'keywords': row['keywords'],
-                    'created_date': row['created_date'],
-                    'is_top_project': row['is_top_project'],
-                    'is_endcustomer': row['is_endcustomer'],
-                    'match_score': score,
-                    'match_debug': debug
-                })
-                
-        for match in matches:
-            self.db.conn.execute("""
-                INSERT INTO matches (
-                    project_id, title, link, company, description, keywords,
-                    created_date, is_top_project, is_endcustomer,
-                    match_score, match_debug
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                match['project_id'], match['title'], match['link'],
-                match['company'], match['description'], match['keywords'],
-                match['created_date'], match['is_top_project'],
-                match['is_endcustomer'], match['match_score'],
-                match['match_debug']
-            ))
-        self.db.conn.commit()
+                if self.incremental and result['inserted'] == 0:
+                    print(f"Seite {page} enthält nur bekannte Projekte, Crawl wird beendet.")
+                    return False
+                return True
 
-    def calculate_match_score(self, row, profile):
+            # Die Pipeline wartet auf noch laufende Abrufe, bevor die Statistik gezählt wird
+            stages = self._run_pipeline(self.iter_pages(gate), store, gate)
+
+            # Nach einem fehlgeschlagenen Abruf fehlen ältere Seiten: die High-Water-Mark
+            # bleibt stehen, damit der nächste Lauf sie nachholt
+            complete = self.failed_page is None
+            newest = progress['newest']
+            previous = state['newest_created_date'] if state else None
+            if complete and newest and (not self._is_crawl_date(previous)
+                                        or newest['eintragungsdatum'] > previous):
+                self.db.save_crawl_state(search_key, newest['link'], newest['eintragungsdatum'])
+
+            pages_processed = progress['pages_processed']
+            stats = {
+                'complete': complete,
+                'failed_page': self.failed_page,
+                'pages_processed': pages_processed,
+                'pages_skipped': self.max_pages - pages_processed,
+                'requests': self.pages_requested,
+                'requests_skipped': self.max_pages - self.pages_requested,
+                'stages': stages,
+                **written,
+            }
+            print(f"Seiten verarbeitet: {stats['pages_processed']}, übersprungen: {stats['pages_skipped']}")
+            print(f"Requests: {stats['requests']}, eingespart: {stats['requests_skipped']}")
+            self._print_write_stats(stats)
+            if not complete:
+                print(f"Crawl unvollständig: Seite {self.failed_page} konnte nicht geladen werden.")
+            return stats
+
+class TermMatcher:
+    """
+    Findet alle Begriffe einer Menge, die als Teilstring in einem Text vorkommen,
+    in einem einzigen Durchlauf.
+
+    Die Begriffe werden zu einer Trie-förmigen Regex kompiliert, die per Lookahead
+    an jeder Position den längsten passenden Begriff findet. Kürzere Begriffe an
+    derselben Position sind Präfixe davon und werden über eine vorberechnete
+    Tabelle ergänzt, so dass auch überlappende Treffer erfasst werden.
+
+    Bei wenigen Begriffen sind einzelne `in`-Prüfungen (in C) schneller als der
+    Regex-Durchlauf; bis `scan_threshold` Begriffe wird daher direkt geprüft.
+    """
+
+    def __init__(self, terms, scan_threshold=64):
+        terms = set(terms)
+        self._always = {''} & terms
+        terms.discard('')
+        self._terms = terms if len(terms) <= scan_threshold else None
+        self._prefixes = {
+            term: [term[:i] for i in range(1, len(term) + 1) if term[:i] in terms]
+            for term in terms
+        }
+        self._regex = re.compile(f"(?=({self._trie_pattern(terms)}))") if terms else None
+
+    @staticmethod
+    def _trie_pattern(terms):
+        trie = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node):
+            branches = [re.escape(char) + build(child)
+                        for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            if len(branches) == 1 and '' not in node:
+                return branches[0]
+            return f"(?:{'|'.join(branches)})" + ('?' if '' in node else '')
+
+        return build(trie)
+
+    def find(self, text):
+        """Menge aller Begriffe, die in `text` (bereits kleingeschrieben) vorkommen."""
+        if self._terms is not None:
+            return {term for term in self._terms if term in text} | self._always
+        hits = set(self._always)
+        if self._regex is not None:
+            for match in self._regex.finditer(text):
+                hits.update(self._prefixes[match.group(1)])
+        return hits
+
+    @staticmethod
+    def _is_word_char(char):
+        # Entspricht \w bei str-Mustern
+        return char.isalnum() or char == '_'
+
+    def _bounded(self, text, start, end):
+        return ((start == 0 or not self._is_word_char(text[start - 1]))
+                and (end == len(text) or not self._is_word_char(text[end])))
+
+    def find_words(self, text):
+        """
+        Begriffe, die mindestens einmal als ganzes Wort vorkommen, also wie bei
+        (?<!\w)begriff(?!\w). Die Wortgrenzen werden an den Fundstellen des
+        Durchlaufs geprüft, der Text wird nur einmal durchsucht.
+        """
+        words = set()
+        if self._always and re.search(r"(?<!\w)(?!\w)", text):
+            words.add('')
+        if self._terms is not None:
+            for term in self._terms:
+                start = text.find(term)
+                while start != -1:
+                    if self._bounded(text, start, start + len(term)):
+                        words.add(term)
+                        break
+                    start = text.find(term, start + 1)
+            return words
+        if self._regex is not None:
+            for match in self._regex.finditer(text):
+                start = match.start()
+                if start and self._is_word_char(text[start - 1]):
+                    continue
+                for term in self._prefixes[match.group(1)]:
+                    end = start + len(term)
+                    if end == len(text) or not self._is_word_char(text[end]):
+                        words.add(term)
+        return words
+
+
+class SkillExtractor:
+    """
+    Extrahiert Skills aus Titel und Beschreibung eines Projekts.
+
+    terms() liefert alle Wörterbuch-Begriffe, die als Teilstring vorkommen (dieselbe
+    Semantik wie beim Scoring) und bildet den Index in project_skills. keywords()
+    behält davon nur ganze Wörter und liefert sie in Schreibweise des Wörterbuchs.
+    """
+
+    def __init__(self, terms):
+        self.names = {}
+        for term in terms:
+            self.names.setdefault(term.lower(), term)
+        self.matcher = TermMatcher(self.names)
+        self._order = {term: i for i, term in enumerate(self.names)}
+
+    @staticmethod
+    def _text(title, description):
+        return f"{title or ''}\n{description or ''}".lower()
+
+    def terms(self, title, description):
+        return self.matcher.find(self._text(title, description))
+
+    def keywords(self, title, description):
+        found = self.matcher.find_words(self._text(title, description))
+        return [self.names[term] for term in sorted(found, key=self._order.get)]
+
+
+def _scan_row(row, matcher, excluded_matcher):
+    description = row['description'].lower() if row['description'] else None
+    return {
+        'has_description': bool(description),
+        'description': matcher.find(description) if description else set(),
+        'excluded': [excluded_matcher.find(row[field].lower())
+                     for field in ('keywords', 'title') if row[field]],
+    }
+
+
+class CompiledProfile:
+    """
+    Ein für das Scoring vorbereitetes Profil: alle Skills, bevorzugten und
+    ausgeschlossenen Keywords teilen sich einen TermMatcher, so dass jedes
+    Textfeld pro Projekt genau einmal durchsucht wird.
+    """
+
+    def __init__(self, profile):
+        self.skills = [s.lower() for s in profile['skills']]
+        self.preferred = [k.lower() for k in profile['preferred_keywords']]
+        self.excluded = [k.lower() for k in profile['excluded_keywords']]
+        self.skill_set = set(self.skills)
+        self.matcher = TermMatcher(self.skills + self.preferred + self.excluded)
+        # Titel und Keywords zählen nur für den Ausschluss
+        self.excluded_matcher = TermMatcher(self.excluded)
+
+        # Listenpositionen je Begriff: Treffer werden als Indizes ins Profil
+        # (inkl. Duplikaten) gespeichert, ohne das Profil zu durchlaufen
+        self._skill_positions = self._positions(self.skills)
+        self._preferred_positions = self._positions(self.preferred)
+        self._excluded_positions = self._positions(self.excluded)
+
+        # Alle echten Teilstrings der Skills für "Keyword steckt in einem Skill"
+        self._skill_substrings = {
+            skill[i:j]
+            for skill in self.skill_set
+            for i in range(len(skill) + 1)
+            for j in range(i, len(skill) + 1)
+            if skill[i:j] != skill
+        }
+
+    @staticmethod
+    def _positions(terms):
+        positions = {}
+        for i, term in enumerate(terms):
+            positions.setdefault(term, []).append(i)
+        return positions
+
+    @staticmethod
+    def _indices(hits, positions):
+        return sorted(i for hit in hits for i in positions.get(hit, ()))
+
+    def is_partial_keyword(self, p_kw):
+        """True, wenn ein anderer Skill im Keyword steckt oder das Keyword in einem Skill."""
+        return p_kw in self._skill_substrings or bool((self.matcher.find(p_kw) & self.skill_set) - {p_kw})
+
+    def scan(self, row):
+        """Durchsucht jedes Textfeld eines Projekts einmal (siehe ProfileSet.scan)."""
+        return _scan_row(row, self.matcher, self.excluded_matcher)
+
+    def score(self, row, scan=None):
+        """
+        Args:
+            row: Projekt (sqlite3.Row oder dict)
+            scan (dict): Ergebnis von scan(); darf Treffer anderer Profile enthalten
+
+        Returns:
+            tuple: Score und seine Bestandteile (siehe explain_match()), kompakt als
+                Teil-Scores und Indizes in Profil- bzw. Projekt-Keyword-Listen
+        """
         score = 0
-        debug_info = []
-        
+        components = {}
+        scan = scan or self.scan(row)
+        description = scan['has_description']
+        description_hits = scan['description']
+
         # Ausschlusskriterien prüfen (zuerst!)
-        excluded = []
-        if row['description']:
-            excluded.extend([k for k in profile['excluded_keywords'] 
-                            if k.lower() in row['description'].lower()])
-        if row['keywords']:
-            excluded.extend([k for k in profile['excluded_keywords'] 
-                            if k.lower() in row['keywords'].lower()])
-        if row['title']:
-            excluded.extend([k for k in profile['excluded_keywords'] 
-                            if k.lower() in row['title'].lower()])
-                            
+        excluded = set(self._indices(description_hits, self._excluded_positions))
+        for hits in scan['excluded']:
+            excluded.update(self._indices(hits, self._excluded_positions))
+
         if excluded:
-            debug_info.append(f"Ausgeschlossen wegen: {list(set(excluded))}")
-            return 0, "\n".join(debug_info)
+            return 0, {'x': sorted(excluded)}
 
         # Keywords Match (50 Punkte)
         if row['keywords'] and row['keywords'] != 'N/A':
-            project_keywords = set(kw.strip().lower() for kw in row['keywords'].split(','))
-            profile_skills = set(s.lower() for s in profile['skills'])
-            
+            # Keyword -> erste Position in der Keyword-Liste des Projekts
+            project_keywords = {}
+            for i, kw in enumerate(row['keywords'].split(',')):
+                project_keywords.setdefault(kw.strip().lower(), i)
+
             # Exakte Matches (30 Punkte)
-            exact_matches = project_keywords.intersection(profile_skills)
+            exact_matches = [i for kw, i in project_keywords.items() if kw in self.skill_set]
             exact_score = (len(exact_matches) / max(len(project_keywords), 1)) * 30
-            
-            # Teilweise Matches (20 Punkte)
-            partial_matches = set()
-            for p_kw in project_keywords:
-                for skill in profile_skills:
-                    if p_kw != skill and (skill in p_kw or p_kw in skill):
-                        partial_matches.add(p_kw)
-            
+
+            # Teilweise Matches (20 Punkte): Skill steckt im Keyword oder umgekehrt
+            partial_matches = [i for kw, i in project_keywords.items() if self.is_partial_keyword(kw)]
+
             partial_score = (len(partial_matches) / max(len(project_keywords), 1)) * 20
-            
+
             score += exact_score + partial_score
-            debug_info.append(f"Exact Keyword Score: {exact_score:.2f}")
-            debug_info.append(f"Partial Keyword Score: {partial_score:.2f}")
-            debug_info.append(f"Exact Matches: {exact_matches}")
-            debug_info.append(f"Partial Matches: {partial_matches}")
+            components['k'] = [round(exact_score, 2), round(partial_score, 2),
+                               exact_matches, partial_matches]
 
         # Beschreibungs-Match mit Gewichtung (30 Punkte)
-        if row['description']:
-            desc_lower = row['description'].lower()
-            
+        if description:
             # Skills in Beschreibung (20 Punkte)
-            matching_skills = [s.lower() for s in profile['skills'] if s.lower() in desc_lower]
+            matching_skills = self._indices(description_hits, self._skill_positions)
             skill_score = min((len(matching_skills) * 4), 20)
-            
+
             # Bevorzugte Keywords (10 Punkte)
-            matching_preferred = [k.lower() for k in profile['preferred_keywords'] if k.lower() in desc_lower]
+            matching_preferred = self._indices(description_hits, self._preferred_positions)
             preferred_score = min((len(matching_preferred) * 2), 10)
-            
+
             score += skill_score + preferred_score
-            debug_info.append(f"Description Skills Score: {skill_score}")
-            debug_info.append(f"Description Preferred Score: {preferred_score}")
-            debug_info.append(f"Skills in Description: {matching_skills}")
-            debug_info.append(f"Preferred in Description: {matching_preferred}")
+            components['d'] = [skill_score, preferred_score, matching_skills, matching_preferred]
 
         # Aktualität (20 Punkte) - exponentieller Verfall
         try:
@@ -439,65 +2213,781 @@ class ProjectMatcher:
             time_score = 0
             days_old = -1
         score += time_score
-        debug_info.append(f"Time Score: {time_score:.2f}")
-        debug_info.append(f"Days Old: {days_old}")
-
-        return score, "\n".join(debug_info)
-
-    def get_statistics(self):
-        cur = self.db.conn.execute("""
-            SELECT
-                AVG(match_score) as avg_score,
-                COUNT(*) as total_matches,
-                MAX(m.match_date) as latest_match,
-                MIN(p.created_date) as oldest_project,
-                COUNT(DISTINCT p.company) as unique_companies
-            FROM matches m
-            JOIN projects p ON m.project_id = p.id
-            WHERE m.match_date >= date('now', '-7 days')
-        """)
-        return dict(cur.fetchone())
+        components['t'] = [round(time_score, 2), days_old]
 
-    def export_matches(self, min_score=30, export_path=None):
-        import csv
-        if export_path is None:
-            export_path = f"matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        return score, components
+
+
+def explain_match(components, profile, keywords):
+    """
+    Lesbare Erklärung eines Scores, erst bei Bedarf (Detailseite) erzeugt.
+
+    Args:
+        components (dict|str): Bestandteile aus CompiledProfile.score() bzw. matches.match_explain
+        profile (dict): Profil der Match-Version (match_profiles.profile)
+        keywords (str): Keywords des Projekts
+
+    Returns:
+        list: Zeilen der Erklärung
+    """
+    if isinstance(components, str):
+        components = json.loads(components)
+    project_keywords = [kw.strip() for kw in (keywords or '').split(',')]
+
+    def names(indices, terms):
+        return ', '.join(terms[i] for i in indices if i < len(terms)) or '-'
+
+    if 'x' in components:
+        return [f"Ausgeschlossen wegen: {names(components['x'], profile['excluded_keywords'])}"]
+
+    lines = []
+    if 'k' in components:
+        exact_score, partial_score, exact, partial = components['k']
+        lines += [
+            f"Exact Keyword Score: {exact_score:.2f}",
+            f"Partial Keyword Score: {partial_score:.2f}",
+            f"Exact Matches: {names(exact, project_keywords)}",
+            f"Partial Matches: {names(partial, project_keywords)}",
+        ]
+    if 'd' in components:
+        skill_score, preferred_score, skills, preferred = components['d']
+        lines += [
+            f"Description Skills Score: {skill_score}",
+            f"Description Preferred Score: {preferred_score}",
+            f"Skills in Description: {names(skills, profile['skills'])}",
+            f"Preferred in Description: {names(preferred, profile['preferred_keywords'])}",
+        ]
+    time_score, days_old = components.get('t', (0, -1))
+    lines += [f"Time Score: {time_score:.2f}", f"Days Old: {days_old}"]
+    return lines
+
+
+class ProfileSet:
+    """
+    Mehrere kompilierte Profile, die sich einen TermMatcher über die Vereinigung
+    aller Begriffe teilen: jedes Projekt wird einmal durchsucht und danach gegen
+    alle Profile gescort.
+    """
+
+    def __init__(self, compiled_profiles):
+        self.profiles = compiled_profiles
+        self.matcher = TermMatcher(
+            term for p in compiled_profiles.values() for term in p.skills + p.preferred + p.excluded
+        )
+        self.excluded_matcher = TermMatcher(
+            term for p in compiled_profiles.values() for term in p.excluded
+        )
+
+    def scan(self, row):
+        return _scan_row(row, self.matcher, self.excluded_matcher)
+
+
+class BatchScorer:
+    """
+    Scort viele Projekte auf einmal mit numpy, gegen alle Profile eines ProfileSet.
+
+    tokenize() durchsucht jedes Projekt einmal mit dem gemeinsamen TermMatcher und
+    erfasst die Treffer als dünn besetzte Term-Dokument-Matrix (Koordinatenform:
+    Dokument- und Term-Index je Treffer), Projekt-Keywords ebenso gegen ein laufend
+    erweitertes Keyword-Vokabular. Die Matrix wird für jedes Profil wiederverwendet:
+    Ausschluss-Maske, Skill-/Keyword-Zählungen und zeitlicher Verfall sind je Profil
+    nur Gewichtungen und Spaltenoperationen. Die Scans bleiben erhalten, damit
+    CompiledProfile.score() für die Matches nicht erneut sucht. Die Scores
+    entsprechen CompiledProfile.score() bis auf Rundungsfehler.
+    """
+
+    def __init__(self, profile_set):
+        if np is None:
+            raise RuntimeError("Batch-Scoring benötigt numpy (pip install numpy)")
+        self.profile_set = profile_set
+        self.terms = sorted({term for p in profile_set.profiles.values()
+                             for term in p.skills + p.preferred + p.excluded})
+        self.term_ids = {term: i for i, term in enumerate(self.terms)}
+        self.weights = {
+            name: (self._weights(p.skills), self._weights(p.preferred), self._weights(p.excluded))
+            for name, p in profile_set.profiles.items()
+        }
+
+        self._keyword_ids = {}
+        self._keywords = []
+        self._keyword_flags = {name: ([], []) for name in profile_set.profiles}
+
+    def _weights(self, terms):
+        weights = np.zeros(len(self.terms))
+        for term in terms:
+            weights[self.term_ids[term]] += 1
+        return weights
+
+    def _keyword_id(self, keyword):
+        keyword_id = self._keyword_ids.get(keyword)
+        if keyword_id is None:
+            keyword_id = self._keyword_ids[keyword] = len(self._keywords)
+            self._keywords.append(keyword)
+        return keyword_id
+
+    def _keyword_arrays(self, name):
+        """Exakt/teilweise passend je Keyword des Vokabulars für ein Profil."""
+        compiled = self.profile_set.profiles[name]
+        exact, partial = self._keyword_flags[name]
+        for keyword in self._keywords[len(exact):]:
+            exact.append(keyword in compiled.skill_set)
+            partial.append(compiled.is_partial_keyword(keyword))
+        return np.array(exact, dtype=float), np.array(partial, dtype=float)
+
+    def tokenize(self, rows, now=None):
+        """Zerlegt die Projekte in Trefferlisten (Koordinatenform), Spaltenvektoren und Scans."""
+        now = now or datetime.now()
+        term_ids = self.term_ids
+        scans = []
+        desc_docs, desc_terms = [], []
+        excl_docs, excl_terms = [], []
+        kw_docs, kw_ids = [], []
+        keyword_cache = {}
+        has_description = np.zeros(len(rows), dtype=bool)
+        has_keywords = np.zeros(len(rows), dtype=bool)
+
+        for doc, row in enumerate(rows):
+            scan = self.profile_set.scan(row)
+            scans.append(scan)
+            if scan['has_description']:
+                has_description[doc] = True
+                hits = scan['description']
+                desc_docs.extend([doc] * len(hits))
+                desc_terms.extend([term_ids[term] for term in hits])
+            for hits in scan['excluded']:
+                excl_docs.extend([doc] * len(hits))
+                excl_terms.extend([term_ids[term] for term in hits])
+
+            keywords = row['keywords']
+            if keywords and keywords != 'N/A':
+                has_keywords[doc] = True
+                ids = keyword_cache.get(keywords)
+                if ids is None:
+                    ids = keyword_cache[keywords] = [
+                        self._keyword_id(keyword)
+                        for keyword in {kw.strip() for kw in keywords.lower().split(',')}]
+                kw_docs.extend([doc] * len(ids))
+                kw_ids.extend(ids)
+
+        days_old, valid_date = self._days_old([row['created_date'] for row in rows], now)
+        as_index = lambda values: np.array(values, dtype=np.int64)
+        return {
+            'n': len(rows), 'scans': scans,
+            'desc_docs': as_index(desc_docs), 'desc_terms': as_index(desc_terms),
+            'excl_docs': as_index(excl_docs), 'excl_terms': as_index(excl_terms),
+            'kw_docs': as_index(kw_docs), 'kw_ids': as_index(kw_ids),
+            'has_description': has_description, 'has_keywords': has_keywords,
+            'days_old': days_old, 'valid_date': valid_date,
+        }
+
+    @staticmethod
+    def _days_old(dates, now):
+        """
+        Alter in ganzen Tagen (abgerundet wie timedelta.days) und Gültigkeitsmaske.
+        Gültig sind nur Werte im Format '%Y-%m-%d %H:%M:%S'; numpy parst sie am Stück,
+        nur bei ungültigen Werten wird einzeln geprüft.
+        """
+        valid = np.ones(len(dates), dtype=bool)
+        try:
+            created = np.array(dates, dtype='datetime64[s]')
+            if any(len(date) != 19 or date[10] != ' ' for date in dates):
+                raise ValueError
+        except (ValueError, TypeError):
+            for i, date in enumerate(dates):
+                try:
+                    datetime.strptime(date, '%Y-%m-%d %H:%M:%S')
+                except (ValueError, TypeError):
+                    valid[i] = False
+            created = np.array([date if ok else 'NaT' for date, ok in zip(dates, valid)],
+                               dtype='datetime64[s]')
+        seconds = (np.datetime64(now.replace(microsecond=0), 's') - created).astype(np.int64)
+        days_old = np.where(valid, seconds // 86400, -1)
+        return days_old, valid
+
+    def scores(self, t):
+        """Scores je Profil aus einem tokenize()-Ergebnis: Profilname -> numpy-Array."""
+        n = t['n']
+        count = lambda docs, weights: np.bincount(docs, weights=weights, minlength=n)
+
+        # Für alle Profile gleich: Keyword-Anzahl und Aktualität (20 Punkte)
+        n_keywords = np.maximum(count(t['kw_docs'], None), 1)
+        time_score = np.where(t['valid_date'], 20 * np.exp(-t['days_old'] / 15), 0.0)
+
+        results = {}
+        for name, (skill_weight, preferred_weight, excluded_weight) in self.weights.items():
+            excluded = (count(t['desc_docs'], excluded_weight[t['desc_terms']])
+                        + count(t['excl_docs'], excluded_weight[t['excl_terms']])) > 0
+
+            # Keywords (50 Punkte)
+            keyword_exact, keyword_partial = self._keyword_arrays(name)
+            exact_score = (count(t['kw_docs'], keyword_exact[t['kw_ids']]) / n_keywords) * 30
+            partial_score = (count(t['kw_docs'], keyword_partial[t['kw_ids']]) / n_keywords) * 20
+
+            # Beschreibung (30 Punkte)
+            skill_score = np.minimum(count(t['desc_docs'], skill_weight[t['desc_terms']]) * 4, 20)
+            preferred_score = np.minimum(count(t['desc_docs'], preferred_weight[t['desc_terms']]) * 2, 10)
+
+            scores = time_score.copy()
+            scores += np.where(t['has_keywords'], exact_score + partial_score, 0.0)
+            scores += np.where(t['has_description'], skill_score + preferred_score, 0.0)
+            results[name] = np.where(excluded, 0.0, scores)
+        return results
+
+    def score(self, rows, now=None):
+        """Scores aller Projekte je Profil (Reihenfolge wie `rows`)."""
+        return self.scores(self.tokenize(rows, now))
+
+
+def _candidate_query(since=None, id_range=None, skills=None, pruned=False):
+    """
+    SQL und Parameter für die zu scorenden Projekte (optional ab `since` bzw. in
+    einem ID-Bereich).
+
+    Ab `since` (last_run, UTC) kommen neben geänderten Projekten auch solche, deren
+    Alter in Tagen sich seitdem geändert hat, denn davon hängen die Punkte für
+    Aktualität ab (genaue Prüfung je Profil: _due_for_rescore).
+
+    Mit `skills` werden nur Projekte geliefert, die laut project_skills einen der
+    Begriffe enthalten; mit pruned=True stattdessen die übrigen, nur mit ID und
+    Datumsspalten. Projekte mit Datum in der Zukunft werden nie aussortiert.
+    """
+    if pruned:
+        columns = "id, created_date, COALESCE(updated_date, scrape_date) AS changed_date"
+    else:
+        columns = "*, COALESCE(updated_date, scrape_date) AS changed_date"
+    sql = f"""
+        SELECT {columns} FROM projects
+        WHERE created_date >= date('now', '-30 days')
+    """
+    params = []
+    if since is not None:
+        sql += """ AND (COALESCE(updated_date, scrape_date) >= ?
+            OR created_date > datetime(?, 'localtime')
+            OR CAST(julianday('now', 'localtime') - julianday(created_date) AS INTEGER)
+               != CAST(julianday(?, 'localtime') - julianday(created_date) AS INTEGER))"""
+        params.extend([since, since, since])
+    if id_range is not None:
+        sql += " AND id BETWEEN ? AND ?"
+        params.extend(id_range)
+    if skills is not None:
+        placeholders = ", ".join("?" * len(skills))
+        clause = (f"(id IN (SELECT project_id FROM project_skills WHERE skill IN ({placeholders}))"
+                  f" OR created_date > datetime('now', 'localtime'))")
+        sql += f" AND NOT {clause}" if pruned else f" AND {clause}"
+        params.extend(sorted(skills))
+    return sql, params
+
+
+def _due_for_rescore(row, run, now):
+    """
+    Muss ein Projekt im Lauf `run` gescort werden? Im inkrementellen Lauf, wenn es
+    seit last_run geändert wurde oder sich sein Alter in Tagen geändert hat.
+    """
+    if run['since'] is None or (row['changed_date'] or '') >= run['since']:
+        return True
+    try:
+        created = datetime.strptime(row['created_date'], '%Y-%m-%d %H:%M:%S')
+    except (ValueError, TypeError):
+        return False
+    last_run = run['since_local']
+    return created > last_run or (now - created).days != (last_run - created).days
+
+
+def _local_time(utc_timestamp):
+    """CURRENT_TIMESTAMP (UTC) als naive Ortszeit wie created_date."""
+    return (datetime.strptime(utc_timestamp, '%Y-%m-%d %H:%M:%S')
+            .replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None))
+
+
+def _score_projects(projects, runs, profile_set, min_score, pruned=()):
+    """
+    Scort Projekte gegen alle Profile eines Laufs.
+
+    Args:
+        projects (list): Projekte aus _candidate_query()
+        runs (dict): Profilname -> {'compiled', 'profile_hash', 'since', 'since_local', 'candidates'}
+        profile_set (ProfileSet): gemeinsamer Matcher über alle Profile
+        pruned (list): vorab aussortierte Projekte (_candidate_query(pruned=True))
+
+    Returns:
+        dict: Profilname -> {'matches', 'below', 'scored', 'pruned'}
+    """
+    results = {name: {'matches': [], 'below': [], 'scored': 0, 'pruned': 0} for name in runs}
+    started = datetime.now()
+    now = started.strftime('%Y-%m-%d %H:%M:%S')
+
+    for row in pruned:
+        for name, run in runs.items():
+            if not _due_for_rescore(row, run, started):
+                continue
+            results[name]['scored'] += 1
+            results[name]['pruned'] += 1
+            results[name]['below'].append((row['id'], run['profile_hash']))
+
+    # Erst klären, welche Profile ein Projekt wirklich scoren müssen
+    todo = []
+    for row in projects:
+        names = []
+        for name, run in runs.items():
+            if not _due_for_rescore(row, run, started):
+                continue
+            result = results[name]
+            result['scored'] += 1
+            if (run['candidates'] is not None and row['id'] not in run['candidates']
+                    and (row['created_date'] or '') <= now):
+                result['pruned'] += 1
+                result['below'].append((row['id'], run['profile_hash']))
+                continue
+            names.append(name)
+        if names:
+            todo.append((row, names))
+
+    # Viele Projekte: ein Scan je Projekt, Scores aller Profile per numpy; nur Projekte
+    # über min_score werden zeilenweise (mit demselben Scan) in Bestandteile zerlegt
+    scans, batch_scores = [None] * len(todo), None
+    if np is not None and len(todo) >= BATCH_SCORING_MIN_ROWS:
+        scorer = BatchScorer(profile_set)
+        tokens = scorer.tokenize([row for row, _ in todo], started)
+        scans, batch_scores = tokens['scans'], scorer.scores(tokens)
+
+    for i, (row, names) in enumerate(todo):
+        scan = scans[i]
+        for name in names:
+            run, result = runs[name], results[name]
+            if batch_scores is not None and batch_scores[name][i] < min_score - BATCH_SCORE_TOLERANCE:
+                result['below'].append((row['id'], run['profile_hash']))
+                continue
+            scan = scan or profile_set.scan(row)
+            score, components = run['compiled'].score(row, scan)
+            if score >= min_score:
+                result['matches'].append((
+                    row['id'], run['profile_hash'], score,
+                    json.dumps(components, separators=(',', ':'))
+                ))
+            else:
+                result['below'].append((row['id'], run['profile_hash']))
+    return results
+
+
+def _score_range(conn, runs, profile_set, min_score, since, id_range=None):
+    """
+    Liest die zu scorenden Projekte (optional eines ID-Bereichs) und scort sie.
+    Können alle Profile per project_skills vorfiltern, werden aussortierte
+    Projekte nur mit ID gelesen.
+
+    Returns:
+        tuple: Anzahl gelesener Projekte, Ergebnis von _score_projects()
+    """
+    terms = [run['candidate_terms'] for run in runs.values()]
+    skills = None if not terms or None in terms else set().union(*terms)
+
+    sql, params = _candidate_query(since, id_range, skills)
+    projects = conn.execute(sql, params).fetchall()
+    pruned = []
+    if skills is not None:
+        sql, params = _candidate_query(since, id_range, skills, pruned=True)
+        pruned = conn.execute(sql, params).fetchall()
+    return (len(projects) + len(pruned),
+            _score_projects(projects, runs, profile_set, min_score, pruned))
 
-        cur = self.db.conn.execute("""
-            SELECT
-                p.title, p.company, p.keywords, p.description,
-                p.created_date, p.link, p.is_top_project,
-                p.is_endcustomer, m.match_score, m.match_debug
-            FROM matches m
-            JOIN projects p ON m.project_id = p.id
-            WHERE m.match_score >= ?
-            ORDER BY m.match_score DESC
-        """, (min_score,))
-        rows = cur.fetchall()
 
-        with open(export_path, 'w', newline='', encoding='utf-8-sig') as fh:
-            w = csv.writer(fh, delimiter=';')
-            w.writerow([d[0] for d in cur.description])
-            w.writerows(rows)
+# Zustand eines Scoring-Prozesses, einmal pro Prozess durch den Initializer gesetzt
+_worker = {}
+
+
+def _init_scoring_worker(db_path, runs, min_score, since):
+    """Übernimmt die kompilierten Profile einmal pro Prozess und öffnet die Datenbank nur lesend."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    _worker.update({
+        'conn': conn,
+        'runs': runs,
+        'profile_set': ProfileSet({name: run['compiled'] for name, run in runs.items()}),
+        'min_score': min_score,
+        'since': since,
+    })
+
+
+def _score_id_range(id_range):
+    """Liest und scort die Projekte eines ID-Bereichs im Scoring-Prozess."""
+    return _score_range(_worker['conn'], _worker['runs'], _worker['profile_set'],
+                        _worker['min_score'], _worker['since'], id_range)
+
+
+class ProjectMatcher:
+    def __init__(self, db):
+        self.db = db
+        self._compiled_profiles = {}
+        
+    @staticmethod
+    def profile_hash(profile, min_score):
+        """Version eines Profils: ändert sich mit Profil, min_score und SCORING_VERSION."""
+        content = json.dumps({
+            'profile': profile,
+            'min_score': min_score,
+            'scoring_version': SCORING_VERSION,
+        }, sort_keys=True)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+
+    def find_matches(self, profile, min_score=30, name='default', full=False, workers=1):
+        """
+        Scort neue und seit dem letzten Lauf geänderte Projekte der letzten 30 Tage
+        sowie Projekte, die seitdem einen Tag älter geworden sind (Aktualität).
+
+        Ergebnisse werden pro (Projekt, Profil-Version) upserted; fällt ein geändertes
+        Projekt unter min_score, wird sein Match entfernt, ebenso Matches von Projekten
+        außerhalb des 30-Tage-Fensters. Ein vollständiges Neu-Scoring erfolgt nur für
+        eine neue Profil-Version oder mit full=True.
+
+        Returns:
+            dict: Anzahl gescorter, gematchter und entfernter Projekte
+        """
+        return self.find_matches_multi({name: profile}, min_score=min_score, full=full,
+                                       workers=workers)[name]
+
+    def find_matches_multi(self, profiles, min_score=30, full=False, workers=1):
+        """
+        Matcht mehrere Profile in einem Durchlauf über die Projekte: jedes Projekt
+        wird einmal gelesen und durchsucht und dann gegen alle Profile gescort.
+        Ergebnisse und Inkrementalität (siehe find_matches) gelten je Profil.
+
+        Mit workers > 1 und mindestens PARALLEL_SCORING_MIN_ROWS Projekten wird in
+        einem Prozess-Pool nach ID-Bereichen gescort (siehe _score_parallel).
+        Geschrieben wird in jedem Fall nur im aufrufenden Prozess.
+
+        Args:
+            profiles (dict): Profilname -> Profil
+            workers (int): Anzahl Scoring-Prozesse
+
+        Returns:
+            dict: Profilname -> Statistik wie bei find_matches
+        """
+        run_started = self.db.conn.execute("SELECT CURRENT_TIMESTAMP").fetchone()[0]
+        runs = {}
+        for name, profile in profiles.items():
+            profile_hash = self.profile_hash(profile, min_score)
+            state = self.db.conn.execute(
+                "SELECT last_run FROM match_profiles WHERE profile_hash = ?", (profile_hash,)
+            ).fetchone()
+            runs[name] = {
+                'profile': profile,
+                'profile_hash': profile_hash,
+                'compiled': self.compile_profile(profile),
+                'since': None if full or state is None else state['last_run'],
+                'since_local': None if full or state is None else _local_time(state['last_run']),
+                'matches': [], 'below': [], 'scored': 0,
+            }
+
+        # Vorfilter über project_skills: Kandidaten-Begriffe und -Projekte je Profil
+        indexed = self.db.indexed_skill_terms()
+        vocabulary = {row[0] for row in self.db.conn.execute("SELECT DISTINCT skill FROM project_skills")}
+        for run in runs.values():
+            run['candidate_terms'] = self._candidate_terms(run['compiled'], indexed, vocabulary, min_score)
+            run['candidates'] = None
+            if run['candidate_terms'] is not None:
+                terms = sorted(run['candidate_terms'])
+                placeholders = ", ".join("?" * len(terms))
+                run['candidates'] = {row[0] for row in self.db.conn.execute(
+                    f"SELECT DISTINCT project_id FROM project_skills WHERE skill IN ({placeholders})",
+                    terms)}
+
+        sinces = [run['since'] for run in runs.values()]
+        since = None if not sinces or None in sinces else min(sinces)
+        scoring_runs = {name: {key: run[key] for key in
+                               ('compiled', 'profile_hash', 'since', 'since_local',
+                                'candidate_terms', 'candidates')}
+                        for name, run in runs.items()}
+
+        started = time.perf_counter()
+        id_ranges = None
+        if workers > 1 and self.db.db_path != ':memory:':
+            sql, params = _candidate_query(since)
+            ids = [row[0] for row in self.db.conn.execute(f"SELECT id FROM ({sql}) ORDER BY id", params)]
+            if len(ids) >= PARALLEL_SCORING_MIN_ROWS:
+                id_ranges = self._id_ranges(ids, workers * 4)
+
+        if id_ranges:
+            rows, scored = self._score_parallel(scoring_runs, min_score, since, id_ranges, workers)
+        else:
+            workers = 1
+            profile_set = ProfileSet({name: run['compiled'] for name, run in runs.items()})
+            rows, scored = _score_range(self.db.conn, scoring_runs, profile_set, min_score, since)
+
+        for name, run in runs.items():
+            run['matches'] = scored[name]['matches']
+            run['below'] = scored[name]['below']
+            run['scored'] = scored[name]['scored']
+            run['pruned'] = scored[name]['pruned']
+
+        seconds = time.perf_counter() - started
+        rate = rows / seconds if seconds else 0.0
+        print(f"Scoring: {rows} Projekte in {seconds:.2f}s ({rate:.0f} Projekte/s, "
+              f"{workers} {'Prozess' if workers == 1 else 'Prozesse'})")
+
+        results = {}
+        for name, run in runs.items():
+            removed = self._write_matches(name, run, min_score, run_started)
+            results[name] = {'profile_hash': run['profile_hash'], 'full': run['since'] is None,
+                             'scored': run['scored'], 'matched': len(run['matches']),
+                             'pruned': run['pruned'], 'removed': removed, 'rows_per_second': rate}
+            print(f"Matching {name} ({'vollständig' if run['since'] is None else 'inkrementell'}): "
+                  f"{run['scored']} Projekte gescort ({run['pruned']} per Skill-Index übersprungen), "
+                  f"{len(run['matches'])} Matches, {removed} entfernt")
+        return results
+
+    @staticmethod
+    def _candidate_terms(compiled, indexed, vocabulary, min_score):
+        """
+        Begriffe, von denen ein Projekt laut project_skills mindestens einen enthalten
+        muss, um min_score zu erreichen; None, wenn nicht sicher vorgefiltert werden kann.
+
+        Ohne Skill, bevorzugtes Keyword und teilweise passendes Keyword bleiben nur die
+        Punkte für Aktualität (höchstens 20). Dafür müssen alle Profilbegriffe indexiert sein.
+
+        Args:
+            indexed (set): vollständig indexierte Begriffe (skill_terms)
+            vocabulary (set): alle Begriffe in project_skills (mögliche Keywords)
+        """
+        terms = set(compiled.skills + compiled.preferred)
+        if min_score <= 20 or not terms <= indexed:
+            return None
+        return terms | {term for term in vocabulary if compiled.is_partial_keyword(term)}
+
+    @staticmethod
+    def _id_ranges(ids, chunks):
+        """Teilt aufsteigende Projekt-IDs in bis zu `chunks` gleich große (erste, letzte)-Bereiche."""
+        size = max(1, -(-len(ids) // chunks))
+        return [(ids[i], ids[min(i + size, len(ids)) - 1]) for i in range(0, len(ids), size)]
+
+    def _score_parallel(self, runs, min_score, since, id_ranges, workers):
+        """
+        Scort die ID-Bereiche in einem Prozess-Pool. Jeder Prozess erhält die
+        kompilierten Profile einmal beim Start und liest seine Projekte selbst.
+
+        Returns:
+            tuple: Anzahl gelesener Projekte, Profilname -> {'matches', 'below', 'scored'}
+        """
+        merged = {name: {'matches': [], 'below': [], 'scored': 0, 'pruned': 0} for name in runs}
+        rows = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_scoring_worker,
+                                 initargs=(self.db.db_path, runs, min_score, since)) as pool:
+            for count, results in pool.map(_score_id_range, id_ranges):
+                rows += count
+                for name, result in results.items():
+                    merged[name]['matches'].extend(result['matches'])
+                    merged[name]['below'].extend(result['below'])
+                    merged[name]['scored'] += result['scored']
+                    merged[name]['pruned'] += result['pruned']
+        return rows, merged
+
+    def _write_matches(self, name, run, min_score, run_started):
+        """Upsert der Matches einer Profil-Version; gibt die Anzahl entfernter Matches zurück."""
+        with self.db.conn:
+            self.db.conn.executemany("""
+                INSERT INTO matches (project_id, profile_hash, match_score, match_explain)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(project_id, profile_hash) DO UPDATE SET
+                    match_score = excluded.match_score,
+                    match_explain = excluded.match_explain,
+                    match_date = CURRENT_TIMESTAMP
+            """, run['matches'])
+            removed = self.db.conn.executemany(
+                "DELETE FROM matches WHERE project_id = ? AND profile_hash = ?", run['below']
+            ).rowcount
+            # Aus dem 30-Tage-Fenster gefallene Projekte würden nie wieder gescort
+            removed += self.db.conn.execute("""
+                DELETE FROM matches WHERE profile_hash = ? AND project_id IN (
+                    SELECT id FROM projects WHERE created_date < date('now', '-30 days'))
+            """, (run['profile_hash'],)).rowcount
+            self.db.conn.execute("""
+                INSERT INTO match_profiles (profile_hash, name, profile, min_score, last_run)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(profile_hash) DO UPDATE SET
+                    name = excluded.name,
+                    last_run = excluded.last_run
+            """, (run['profile_hash'], name, json.dumps(run['profile']), min_score, run_started))
+            self.db.refresh_statistics(run['profile_hash'])
+        return removed
+
+    def compile_profile(self, profile):
+        """Kompiliert ein Profil einmalig und cached es für weitere Aufrufe."""
+        key = json.dumps(profile, sort_keys=True)
+        compiled = self._compiled_profiles.get(key)
+        if compiled is None:
+            compiled = self._compiled_profiles[key] = CompiledProfile(profile)
+        return compiled
+
+    def calculate_match_score(self, row, profile):
+        return self.compile_profile(profile).score(row)
+
+    def verify_batch_scores(self, profiles, rows=None, tolerance=1e-9):
+        """
+        Vergleicht BatchScorer (alle Profile in einem Durchlauf) mit dem
+        zeilenweisen Scoring jedes Profils.
+
+        Args:
+            profiles (dict): Profilname -> Profil
+            rows (list): Projekte (Standard: alle Projekte der Datenbank)
+
+        Returns:
+            dict: Profilname -> Anzahl Projekte, größte Abweichung und IDs mit
+                  Abweichung über `tolerance`
+        """
+        if rows is None:
+            rows = self.db.conn.execute("SELECT * FROM projects").fetchall()
+        compiled = {name: self.compile_profile(profile) for name, profile in profiles.items()}
+        batch_scores = BatchScorer(ProfileSet(compiled)).score(rows, now=datetime.now())
+        results = {}
+        for name, profile in compiled.items():
+            row_scores = np.array([profile.score(row)[0] for row in rows], dtype=float)
+            diff = np.abs(batch_scores[name] - row_scores)
+            results[name] = {
+                'rows': len(rows),
+                'max_diff': float(diff.max()) if len(rows) else 0.0,
+                'mismatches': [rows[i]['id'] for i in np.nonzero(diff > tolerance)[0]],
+            }
+        return results
+
+    def get_statistics(self, profile_hash=None):
+        profile_hash = profile_hash or self.db.current_profile_hash()
+        return read_statistics(self.db.conn, profile_hash)['overview']
+
+    def verify_statistics(self):
+        """
+        Gleicht die Rollups der aktuellen Version jedes Profils mit den Live-Aggregaten ab.
+        Ältere Versionen werden nicht mehr gematcht und daher nicht aktualisiert.
+        """
+        hashes = [row['profile_hash'] for row in self.db.conn.execute("""
+            SELECT profile_hash FROM match_profiles mp
+            WHERE last_run = (SELECT MAX(last_run) FROM match_profiles WHERE name = mp.name)
+        """)] or [None]
+        return {profile_hash: verify_statistics(self.db.conn, profile_hash) for profile_hash in hashes}
+
+    def export_matches(self, min_score=30, export_path=None, profile_hash=None, fmt='csv', compress=False):
+        """Schreibt die Matches per iter_export() blockweise in eine Datei."""
+        profile_hash = profile_hash or self.db.current_profile_hash()
+        if export_path is None:
+            export_path = export_filename(f"matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                                          fmt, compress)
+
+        with open(export_path, 'wb') as fh:
+            for chunk in iter_export(self.db.conn, profile_hash, min_score, fmt, compress):
+                fh.write(chunk)
 
         return export_path
 
 
 if __name__ == "__main__":
-    db = FreelancermapDatabase()
+    parser = argparse.ArgumentParser(description="Freelancermap Scraper + Matching")
+    parser.add_argument('--replay', action='store_true',
+                        help="Projekte offline aus dem Response-Cache neu aufbauen statt zu scrapen")
+    parser.add_argument('--since', help="Replay nur ab diesem Zeitpunkt (YYYY-MM-DD HH:MM:SS)")
+    parser.add_argument('--profiles', default=PROFILES_FILE,
+                        help="JSON-Datei mit mehreren Profilen (Standard: %(default)s)")
+    parser.add_argument('--full-rescore', action='store_true',
+                        help="Alle Projekte neu scoren statt nur neue/geänderte")
+    parser.add_argument('--workers', type=int, default=SCORING_WORKERS,
+                        help="Prozesse für das Scoring großer Bestände (Standard: %(default)s)")
+    parser.add_argument('--index-skills', action='store_true',
+                        help="Keywords und Skill-Index aller Projekte neu extrahieren")
+    parser.add_argument('--export-format', choices=export_formats(), default='csv',
+                        help="Format des Exports nach dem Matching (Parquet benötigt pyarrow)")
+    parser.add_argument('--gzip', action='store_true',
+                        help="Export komprimieren (CSV/JSONL als .gz, Parquet intern)")
+    parser.add_argument('--compact', nargs='?', const='full', choices=['full', 'incremental'],
+                        help="Datenbank verkleinern: VACUUM (full) oder nur die Freelist kürzen (incremental)")
+    parser.add_argument('--verify-stats', action='store_true',
+                        help="Statistik-Rollups gegen die Live-Aggregate prüfen")
+    parser.add_argument('--verify-batch', action='store_true',
+                        help="Batch-Scoring (numpy) gegen das zeilenweise Scoring prüfen")
+    parser.add_argument('--benchmark-cleaner', action='store_true',
+                        help="Beschreibungs-Parser gegen BeautifulSoup prüfen "
+                             "(synthetischer Korpus, Randfälle und Response-Cache)")
+    args = parser.parse_args()
+
+    if args.benchmark_cleaner:
+        from benchmark import generate_projects
+        cache = ResponseCache(RESPONSE_CACHE_DIR)
+        corpora = {
+            'Synthetisch': [project['description'] for project in generate_projects(2000)],
+            'Randfälle': list(DescriptionCleaner.EDGE_CASES),
+            'Response-Cache': [
+                project['description']
+                for entry in cache.entries()
+                for project in FreelancermapScraper._page_items(json.loads(cache.load(entry['sha256'])))
+                if project.get('description')
+            ],
+        }
+        mismatches = 0
+        for name, descriptions in corpora.items():
+            result = DescriptionCleaner.compare(descriptions)
+            mismatches += len(result['mismatches'])
+            print(f"{name}: {result['samples']} Beschreibungen, Fallbacks: {result['fallbacks']}, "
+                  f"Abweichungen: {len(result['mismatches'])}")
+            print(f"  fast: {result['fast_seconds'] * 1000:.1f} ms, bs4: {result['bs4_seconds'] * 1000:.1f} ms")
+            for html in result['mismatches'][:5]:
+                print(f"  {html[:120]!r}")
+        sys.exit(1 if mismatches else 0)
+
+    profiles = load_profiles(args.profiles)
+    db = FreelancermapDatabase(terms=skill_terms(profiles))
+
+    if args.index_skills:
+        result = db.index_skills()
+        print(f"Skill-Index: {result['projects']} Projekte, {result['updated']} mit neuen Keywords")
+        sys.exit(0)
+
+    if args.compact:
+        result = db.compact(incremental=args.compact == 'incremental')
+        print(f"Kompaktierung ({result['mode']}): Datei {result['before_file'] / 1e6:.1f} MB -> "
+              f"{result['after_file'] / 1e6:.1f} MB, inkl. WAL {result['before'] / 1e6:.1f} MB -> "
+              f"{result['after'] / 1e6:.1f} MB (freie Seiten {result['free_pages']} -> "
+              f"{result['free_pages_after']})")
+        sys.exit(0)
+
+    if args.verify_stats:
+        results = ProjectMatcher(db).verify_statistics()
+        for profile_hash, differences in results.items():
+            print(f"{profile_hash}: {len(differences)} Abweichungen")
+            for difference in differences:
+                print(f"  {difference}")
+        sys.exit(1 if any(results.values()) else 0)
+
+    if args.verify_batch:
+        results = ProjectMatcher(db).verify_batch_scores(profiles)
+        for name, result in results.items():
+            print(f"{name}: Projekte: {result['rows']}, max. Abweichung: {result['max_diff']:.2e}, "
+                  f"Abweichungen: {len(result['mismatches'])}")
+        sys.exit(1 if any(result['mismatches'] for result in results.values()) else 0)
+
     scraper = FreelancermapScraper(
         db=db,
         username=FREELANCERMAP_USERNAME,
         password=FREELANCERMAP_PASSWORD,
-        max_pages=MAX_PAGES
+        max_pages=MAX_PAGES,
+        concurrency=CONCURRENCY,
+        incremental=INCREMENTAL,
+        cookie_file=COOKIE_FILE,
+        response_cache=ResponseCache(RESPONSE_CACHE_DIR) if RESPONSE_CACHE_DIR else None
     )
-    scraper.scrape()
+    if args.replay:
+        scraper.replay(since=args.since)
+    else:
+        scraper.scrape()
     
     matcher = ProjectMatcher(db)
-    matcher.find_matches(PROFILE, min_score=MIN_SCORE)
-    stats = matcher.get_statistics()
-    
-    print(f"Matches: {stats['total_matches']}")
-    print(f"Durchschnitt Score: {(stats['avg_score'] or 0):.2f}")
-    
-    matcher.export_matches(min_score=MIN_SCORE)
\ No newline at end of file
+    results = matcher.find_matches_multi(profiles, min_score=MIN_SCORE, full=args.full_rescore,
+                                         workers=args.workers)
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    for name, result in results.items():
+        stats = matcher.get_statistics(result['profile_hash'])
+        prefix = f"[{name}] " if len(results) > 1 else ""
+        print(f"{prefix}Matches: {stats['total_matches']}")
+        print(f"{prefix}Durchschnitt Score: {(stats['avg_score'] or 0):.2f}")
+
+        export_path = export_filename(f"matches_{name}_{timestamp}" if len(results) > 1
+                                      else f"matches_{timestamp}", args.export_format, args.gzip)
+        matcher.export_matches(min_score=MIN_SCORE, export_path=export_path,
+                               profile_hash=result['profile_hash'],
+                               fmt=args.export_format, compress=args.gzip)
\ No newline at end of file
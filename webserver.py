@@ -1,7 +1,18 @@
 import os
+import re
+import json
+import base64
+import hashlib
 import sqlite3
-from flask import Flask, render_template, request, g
+import threading
+import functools
+from urllib.parse import quote
+from collections import OrderedDict
+from flask import Flask, render_template, request, g, abort, jsonify
+from markupsafe import Markup, escape
 from version import __version__
+from projectMatcher import (FreelancermapDatabase, CompiledProfile, EXPORT_FORMATS, explain_match,
+                            export_filename, export_formats, iter_export, read_statistics)
 from werkzeug.middleware.proxy_fix import ProxyFix
 import sys
 
@@ -19,150 +30,540 @@ app.wsgi_app = ProxyFix(app.wsgi_app)
 def inject_version():
     return {'version': __version__}
 
-# Database path (can be adjusted)
-DATABASE = os.path.join(BASE_DIR, 'freelancermap.db')
+# Database path (can be adjusted, e.g. FREELANCERMAP_DB=/path/to/db for benchmarks)
+DATABASE = os.environ.get('FREELANCERMAP_DB') or os.path.join(BASE_DIR, 'freelancermap.db')
+
+
+class PageCache:
+    """
+    LRU cache of rendered pages, valid for one version of the database.
+
+    The version is PRAGMA data_version of a long-lived read-only connection,
+    which changes whenever any other connection (scraper, matcher, sqlite_web)
+    commits, plus the identity of the database file so that a replaced file
+    also invalidates the cache.
+    """
+
+    def __init__(self, path, max_entries=256):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._file_id = None
+        self._version = None
+
+    def version(self):
+        """Current database version; a new version empties the cache. None if there is no database."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        file_id = (stat.st_dev, stat.st_ino)
+        with self._lock:
+            if self._conn is None or file_id != self._file_id:
+                if self._conn is not None:
+                    self._conn.close()
+                self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                             check_same_thread=False)
+                self._file_id = file_id
+            version = (file_id, self._conn.execute("PRAGMA data_version").fetchone()[0])
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            return version
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, version, entry):
+        """Stores a page rendered at `version`; dropped if the database changed meanwhile."""
+        with self._lock:
+            if version != self._version:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self._entries), 'max_entries': self.max_entries}
+
+
+page_cache = PageCache(DATABASE)
+
+
+def cached_page(view):
+    """Serve a page from page_cache with a strong ETag; If-None-Match hits get a 304."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if _sql_trace is not None:
+            # check_query_plans() needs every page to run its queries
+            return view(*args, **kwargs)
+        version = page_cache.version()
+        key = request.full_path
+        entry = page_cache.get(key) if version else None
+        if entry is None:
+            response = app.make_response(view(*args, **kwargs))
+            if version is None or response.status_code != 200:
+                return response
+            body = response.get_data()
+            entry = (body, response.mimetype, hashlib.sha256(body).hexdigest())
+            page_cache.put(key, version, entry)
+            cache_status = 'MISS'
+        else:
+            cache_status = 'HIT'
+
+        body, mimetype, etag = entry
+        response = app.response_class(body, mimetype=mimetype)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Cache'] = cache_status
+        return response.make_conditional(request)
+    return wrapper
+
+# Collects executed SQL while check_query_plans() runs (None = off)
+_sql_trace = None
+
+
+class ConnectionPool:
+    """
+    Idle read-only connections to the database, reused across requests.
+
+    Connections are opened with URI mode=ro and a large mmap/page cache, so
+    warm pages survive between requests. The pool belongs to one process: after
+    a fork (multi-worker WSGI servers) the inherited connections are dropped
+    unused. Connections opened on a database file that has since been replaced
+    are closed instead of being handed out again.
+    """
+
+    def __init__(self, path, max_idle=8, mmap_size=256 * 1024 * 1024, cache_kib=32 * 1024):
+        self.path = path
+        self.max_idle = max_idle
+        self.mmap_size = mmap_size
+        self.cache_kib = cache_kib
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _file_id(self):
+        stat = os.stat(self.path)
+        return (stat.st_dev, stat.st_ino)
+
+    def _open(self, file_id):
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_kib)}")
+        conn.execute("PRAGMA query_only = ON")
+        return conn, file_id
+
+    def acquire(self):
+        """An idle connection for the current database file, or a new one."""
+        file_id = self._file_id()
+        stale = []
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: the parent's connections must not be used here
+                self._idle, self._pid = [], os.getpid()
+            while self._idle:
+                conn, conn_file_id = self._idle.pop()
+                if conn_file_id == file_id:
+                    break
+                stale.append(conn)
+            else:
+                conn = None
+        for old in stale:
+            old.close()
+        return (conn, file_id) if conn is not None else self._open(file_id)
+
+    def release(self, pooled):
+        """Returns a connection to the pool (or closes it if it is not worth keeping)."""
+        conn, file_id = pooled
+        conn.set_trace_callback(None)
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            current = self._file_id()
+        except FileNotFoundError:
+            current = None
+        with self._lock:
+            if self._pid == os.getpid() and file_id == current and len(self._idle) < self.max_idle:
+                self._idle.append(pooled)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+
+db_pool = ConnectionPool(DATABASE)
+
 
 def get_db():
-    """Establish a database connection."""
-    db = getattr(g, '_database', None)
-    if db is None:
-        db = g._database = sqlite3.connect(DATABASE)
-        db.row_factory = sqlite3.Row
-    return db
+    """Read-only database connection for the current request, taken from db_pool."""
+    pooled = getattr(g, '_database', None)
+    if pooled is None:
+        pooled = g._database = db_pool.acquire()
+        if _sql_trace is not None:
+            pooled[0].set_trace_callback(_sql_trace.append)
+    return pooled[0]
+
+def current_profile():
+    """Latest matched version (profile_hash, last_run) of the profile chosen via ?profile=."""
+    name = request.args.get('profile') or None
+    if name is None:
+        return get_db().execute(
+            "SELECT profile_hash, last_run FROM match_profiles ORDER BY last_run DESC LIMIT 1"
+        ).fetchone()
+    return get_db().execute(
+        "SELECT profile_hash, last_run FROM match_profiles WHERE name = ? ORDER BY last_run DESC LIMIT 1",
+        (name,)
+    ).fetchone()
+
+def current_profile_hash():
+    """Latest matched version of the profile chosen via ?profile= (default: most recent run)."""
+    row = current_profile()
+    return row['profile_hash'] if row else None
+
+@app.context_processor
+def inject_profiles():
+    names = [row['name'] for row in get_db().execute(
+        "SELECT DISTINCT name FROM match_profiles ORDER BY name")]
+    return {'profiles': names, 'selected_profile': request.args.get('profile')}
 
 @app.teardown_appcontext
 def close_connection(exception):
-    """Close database connection at the end of the request."""
-    db = getattr(g, '_database', None)
-    if db is not None:
-        db.close()
+    """Return the request's connection to the pool."""
+    pooled = g.pop('_database', None)
+    if pooled is not None:
+        db_pool.release(pooled)
+
+MATCHES_PER_PAGE = 20
+MIN_LIST_SCORE = 30
+
+# Match count per profile version, keyed by last_run: the matcher bumps last_run
+# whenever it writes matches, so a cached count is valid until the next match run
+_count_cache = {}
+_count_lock = threading.Lock()
+
+
+def encode_cursor(match_score, match_id):
+    """Opaque page token for a position in the (match_score, id) ordering."""
+    return base64.urlsafe_b64encode(json.dumps([match_score, match_id]).encode()).decode()
+
+
+def decode_cursor(token):
+    try:
+        match_score, match_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return float(match_score), int(match_id)
+    except (ValueError, TypeError):
+        abort(400, "Invalid page token")
+
+
+def match_count(profile):
+    """Number of listed matches of a profile version, counted once per match run."""
+    if profile is None:
+        return 0
+    key = profile['profile_hash']
+    with _count_lock:
+        cached = _count_cache.get(key)
+    if cached and cached[0] == profile['last_run']:
+        return cached[1]
+    total = get_db().execute("""
+        SELECT COUNT(*) as total
+        FROM matches
+        WHERE match_score >= ?
+          AND profile_hash IS ?
+    """, (MIN_LIST_SCORE, key)).fetchone()['total']
+    with _count_lock:
+        _count_cache[key] = (profile['last_run'], total)
+    return total
+
 
 @app.route('/')
+@cached_page
 def index():
-    """Main page with project matches."""
-    page = request.args.get('page', 1, type=int)
-    per_page = 20
-    offset = (page - 1) * per_page
+    """Main page with project matches, paged by (match_score, id) keyset."""
+    after = request.args.get('after')
+    before = request.args.get('before')
+    profile = current_profile()
+    profile_hash = profile['profile_hash'] if profile else None
 
-    # Get total matches
-    cur = get_db().cursor()
-    cur.execute("""
-        SELECT COUNT(*) as total 
-        FROM matches 
-        WHERE match_score >= 30
-    """)
-    total_matches = cur.fetchone()['total']
-    total_pages = (total_matches + per_page - 1) // per_page
-
-    # Fetch matches with pagination
-    cur.execute("""
-        SELECT 
-            p.title, 
-            p.company, 
-            p.keywords, 
-            substr(p.description, 1, 300) as description, 
-            p.created_date, 
-            p.link, 
+    # Walking backwards reads in ascending order and flips the page afterwards
+    if before:
+        cursor_clause, order, cursor = "AND (m.match_score, m.id) > (?, ?)", "ASC", decode_cursor(before)
+    elif after:
+        cursor_clause, order, cursor = "AND (m.match_score, m.id) < (?, ?)", "DESC", decode_cursor(after)
+    else:
+        cursor_clause, order, cursor = "", "DESC", ()
+
+    matches = get_db().execute(f"""
+        SELECT
+            m.id as match_id,
+            p.title,
+            p.company,
+            p.keywords,
+            substr(p.description, 1, 300) as description,
+            p.created_date,
+            p.link,
             p.is_top_project,
-            p.is_endcustomer, 
-            m.match_score, 
-            m.match_debug
+            p.is_endcustomer,
+            m.match_score
         FROM matches m
         JOIN projects p ON m.project_id = p.id
-        WHERE m.match_score >= 30
-        ORDER BY m.match_score DESC
-        LIMIT ? OFFSET ?
-    """, (per_page, offset))
-    
-    matches = cur.fetchall()
+        WHERE m.match_score >= ?
+          AND m.profile_hash IS ?
+          {cursor_clause}
+        ORDER BY m.match_score {order}, m.id {order}
+        LIMIT ?
+    """, (MIN_LIST_SCORE, profile_hash, *cursor, MATCHES_PER_PAGE + 1)).fetchall()
 
-    return render_template('index.html', 
-                           matches=matches, 
-                           page=page, 
-                           total_pages=total_pages,
-                           total_matches=total_matches)
+    has_more = len(matches) > MATCHES_PER_PAGE
+    matches = matches[:MATCHES_PER_PAGE]
+    if before:
+        matches.reverse()
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = bool(after), has_more
+
+    prev_token = next_token = None
+    if matches:
+        first, last = matches[0], matches[-1]
+        if has_prev:
+            prev_token = encode_cursor(first['match_score'], first['match_id'])
+        if has_next:
+            next_token = encode_cursor(last['match_score'], last['match_id'])
+
+    return render_template('index.html',
+                           matches=matches,
+                           prev_token=prev_token,
+                           next_token=next_token,
+                           total_matches=match_count(profile))
+
+# Markers for FTS5 highlight()/snippet(); replaced by <mark> after HTML escaping
+HIGHLIGHT_START, HIGHLIGHT_END = '\x02', '\x03'
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+
+@app.template_filter('highlight')
+def highlight_filter(text):
+    """Escape search result text and render the FTS5 highlight markers as <mark>."""
+    html = str(escape(text or ''))
+    return Markup(html.replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>'))
+
+
+@app.route('/search')
+@cached_page
+def search():
+    """Full-text search over all projects, ranked by bm25."""
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = 20
+    results, has_next, error = [], False, None
+
+    match = fts_query(query)
+    if match:
+        try:
+            # ORDER BY rank (bm25, title > company > description) lets FTS5 sort
+            # internally, so highlight() and snippet() run only for the page
+            results = get_db().execute("""
+                SELECT
+                    p.id,
+                    highlight(projects_fts, 0, ?, ?) as title,
+                    highlight(projects_fts, 1, ?, ?) as company,
+                    snippet(projects_fts, 2, ?, ?, '…', 32) as description,
+                    p.created_date,
+                    p.link,
+                    p.is_top_project,
+                    p.is_endcustomer,
+                    m.match_score
+                FROM projects_fts
+                JOIN projects p ON p.id = projects_fts.rowid
+                LEFT JOIN matches m ON m.project_id = p.id AND m.profile_hash IS ?
+                WHERE projects_fts MATCH ?
+                ORDER BY rank
+                LIMIT ? OFFSET ?
+            """, (HIGHLIGHT_START, HIGHLIGHT_END) * 3 + (
+                current_profile_hash(), match, per_page + 1, (page - 1) * per_page
+            )).fetchall()
+        except sqlite3.OperationalError as e:
+            error = f"Suche nicht verfügbar: {e}"
+        has_next = len(results) > per_page
+        results = results[:per_page]
+
+    return render_template('search.html',
+                           query=query,
+                           results=results,
+                           page=page,
+                           has_next=has_next,
+                           error=error)
 
 @app.route('/project/<int:project_id>')
+@cached_page
 def project_detail(project_id):
     """Detailed view of a specific project."""
+    profile_hash = current_profile_hash()
     cur = get_db().cursor()
     cur.execute("""
         SELECT 
             p.*, 
             m.match_score, 
-            m.match_debug
+            m.match_explain,
+            mp.profile
         FROM projects p
         JOIN matches m ON p.id = m.project_id
+        LEFT JOIN match_profiles mp ON mp.profile_hash = m.profile_hash
         WHERE p.id = ?
-    """, (project_id,))
+          AND m.profile_hash IS ?
+    """, (project_id, profile_hash))
     
     project = cur.fetchone()
     
     if not project:
         return "Project not found", 404
-    
-    return render_template('project_detail.html', project=project)
+
+    return render_template('project_detail.html', project=project,
+                           explanation=match_explanation(project))
+
+def match_explanation(project):
+    """Render the stored score components of a detail row as text lines (None without a profile)."""
+    if not project['profile']:
+        return None
+    profile = json.loads(project['profile'])
+    components = project['match_explain']
+    if components is None:
+        # Matched before scores were stored as components: rescore this one project
+        components = CompiledProfile(profile).score(project)[1]
+    return explain_match(components, profile, project['keywords'])
 
 @app.route('/statistics')
+@cached_page
 def statistics():
-    """Display project matching statistics."""
-    cur = get_db().cursor()
-    
-    # Overall statistics
-    cur.execute("""
-        SELECT
-            AVG(m.match_score) as avg_score,
-            COUNT(*) as total_matches,
-            MAX(m.match_date) as latest_match,
-            MIN(p.created_date) as oldest_project,
-            COUNT(DISTINCT p.company) as unique_companies
-        FROM matches m
-        JOIN projects p ON m.project_id = p.id
-        WHERE m.match_date >= date('now', '-7 days')
-    """)
-    stats = cur.fetchone()
-    
-    # Score distribution
-    cur.execute("""
-        SELECT 
-            CASE 
-                WHEN match_score < 30 THEN '0-30'
-                WHEN match_score BETWEEN 30 AND 50 THEN '30-50'
-                WHEN match_score BETWEEN 50 AND 70 THEN '50-70'
-                ELSE '70-100'
-            END as score_range,
-            COUNT(*) as count
-        FROM matches
-        GROUP BY score_range
-        ORDER BY 
-            CASE score_range
-                WHEN '0-30' THEN 1
-                WHEN '30-50' THEN 2
-                WHEN '50-70' THEN 3
-                ELSE 4
-            END
-    """)
-    score_distribution = cur.fetchall()
-    
-    # Top companies
-    cur.execute("""
-        SELECT
-            p.company,
-            COUNT(*) as project_count,
-            AVG(m.match_score) as avg_match_score
-        FROM matches m
-        JOIN projects p ON m.project_id = p.id
-        WHERE p.company != 'N/A'
-        GROUP BY p.company
-        ORDER BY project_count DESC
-        LIMIT 10
-    """)
-    top_companies = cur.fetchall()
-    
-    return render_template('statistics.html', 
-                           stats=stats, 
-                           score_distribution=score_distribution,
-                           top_companies=top_companies)
+    """Display project matching statistics from the rollups written at match time."""
+    rollups = read_statistics(get_db(), current_profile_hash())
+    return render_template('statistics.html',
+                           stats=rollups['overview'],
+                           score_distribution=rollups['distribution'],
+                           top_companies=rollups['top_companies'])
+
+@app.route('/export')
+def export():
+    """
+    Stream the matches of the selected profile as a download.
+
+    Query parameters: format (csv, jsonl, parquet), gzip=1, min_score. Rows are
+    read and encoded block by block while the response is sent, on a pooled
+    connection of its own, so the worker never holds the whole export.
+    """
+    fmt = request.args.get('format', 'csv')
+    if fmt not in export_formats():
+        abort(400)
+    compress = request.args.get('gzip') in ('1', 'true')
+    min_score = request.args.get('min_score', MIN_LIST_SCORE, type=float)
+    profile_hash = current_profile_hash()
+
+    def generate():
+        pooled = db_pool.acquire()
+        try:
+            yield from iter_export(pooled[0], profile_hash, min_score, fmt, compress)
+        finally:
+            db_pool.release(pooled)
+
+    filename = export_filename(f"matches_{request.args.get('profile') or 'aktuell'}", fmt, compress)
+    response = app.response_class(
+        generate(),
+        mimetype='application/gzip' if compress and fmt != 'parquet' else EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+    # Keep reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/cache-stats')
+def cache_stats():
+    """Hit and miss counters of the page cache."""
+    return jsonify(page_cache.stats())
+
+FTS_INTERNAL_SQL = re.compile(r"'main'\.'\w+_fts_(?:config|data|idx|docsize|content)'")
+
+
+def full_scans(db, sql):
+    """Query plan steps of `sql` that scan a table without an index."""
+    plan = db.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [row['detail'] for row in plan
+            if row['detail'].startswith('SCAN ')
+            and 'INDEX' not in row['detail']
+            and 'CONSTANT ROW' not in row['detail']]
+
+
+def check_query_plans():
+    """
+    Requests every page through the test client, records the SQL it runs and
+    checks each statement's query plan for full table scans.
+
+    Returns:
+        list: (path, sql, scans) for every statement that scans without an index
+    """
+    global _sql_trace
+    db = sqlite3.connect(DATABASE)
+    db.row_factory = sqlite3.Row
+    row = db.execute("""
+        SELECT id, project_id, match_score FROM matches
+        WHERE profile_hash IS (SELECT profile_hash FROM match_profiles ORDER BY last_run DESC LIMIT 1)
+        LIMIT 1
+    """).fetchone()
+    paths = ['/', '/statistics', '/search?q=python']
+    if row:
+        token = encode_cursor(row['match_score'], row['id'])
+        paths += [f"/project/{row['project_id']}", f"/?after={token}", f"/?before={token}"]
+    paths += [f"{path}{'&' if '?' in path else '?'}profile={name}"
+              for name in [r['name'] for r in db.execute("SELECT DISTINCT name FROM match_profiles")][:1]
+              for path in ('/', '/statistics')]
+
+    failures = []
+    client = app.test_client()
+    for path in paths:
+        _sql_trace = []
+        try:
+            status = client.get(path).status_code
+            statements = _sql_trace
+        finally:
+            _sql_trace = None
+        print(f"{path}: {status}, {len(statements)} queries")
+        for sql in statements:
+            if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                continue
+            if FTS_INTERNAL_SQL.search(sql):
+                # FTS5 reads its own shadow tables (tiny config, segment lookups by key)
+                continue
+            scans = full_scans(db, sql)
+            if scans:
+                failures.append((path, sql, scans))
+    db.close()
+    return failures
+
 
 def create_templates():
     """Create template files in the templates directory."""
@@ -268,12 +669,11 @@ def create_templates():
         {% endfor %}
 
         <div class="pagination">
-            {% if page > 1 %}
-                <a href="/?page={{ page - 1 }}">Vorherige</a>
+            {% if prev_token %}
+                <a href="/?before={{ prev_token|urlencode }}">Vorherige</a>
             {% endif %}
-            Seite {{ page }} von {{ total_pages }}
-            {% if page < total_pages %}
-                <a href="/?page={{ page + 1 }}">Nächste</a>
+            {% if next_token %}
+                <a href="/?after={{ next_token|urlencode }}">Nächste</a>
             {% endif %}
         </div>
         {% endblock %}
@@ -302,7 +702,7 @@ def create_templates():
             
             <h3>Match Details</h3>
             <p><strong>Match Score:</strong> {{ project['match_score']|round(2) }}</p>
-            <pre>{{ project['match_debug'] }}</pre>
+            {% if explanation %}<pre>{{ explanation|join('\\n') }}</pre>{% endif %}
         </div>
         {% endblock %}
         ''',
@@ -364,6 +764,9 @@ def create_templates():
     # Write templates
     for filename, content in templates.items():
         filepath = os.path.join(TEMPLATE_DIR, filename)
+        if os.path.exists(filepath):
+            # Never replace the maintained templates with these fallbacks
+            continue
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(content)
@@ -372,10 +775,33 @@ def create_templates():
             print(f"Error creating template {filename}: {e}")
 
 
+def schema_outdated(path=DATABASE):
+    """True if the database still lacks migrations (checked read-only, nothing is written)."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0] < len(FreelancermapDatabase.MIGRATIONS)
+    finally:
+        conn.close()
+
+
 if __name__ == '__main__':
 
     #create_templates()
 
+    if '--migrate' in sys.argv:
+        # Explicit step before starting WSGI workers, which never migrate themselves
+        FreelancermapDatabase(DATABASE).close()
+        print(f"Database schema of {DATABASE} is up to date")
+        sys.exit(0)
+
+    if '--check-query-plans' in sys.argv:
+        FreelancermapDatabase(DATABASE).close()
+        failures = check_query_plans()
+        for path, sql, scans in failures:
+            print(f"\n{path}: {', '.join(scans)}\n{sql.strip()}")
+        print(f"\n{len(failures)} queries without index" if failures else "All queries use an index")
+        sys.exit(1 if failures else 0)
+
     # Print database location for debugging
     print(f"Database location: {DATABASE}")
     
@@ -384,10 +810,17 @@ if __name__ == '__main__':
         print("ERROR: Database file not found!")
         print(f"Please ensure {DATABASE} exists.")
         sys.exit(1)
+
+    # Bring the schema of older databases up to date
+    FreelancermapDatabase(DATABASE).close()
     
     # Run the app
     app.run(debug=True)
 
-# Expose the app for WSGI servers
+# Expose the app for WSGI servers. Workers only read: several of them importing at
+# once would race on the migrations, so an outdated schema has to be migrated first.
 if __name__ != '__main__':
-    create_templates()
\ No newline at end of file
+    create_templates()
+    if os.path.exists(DATABASE) and schema_outdated():
+        raise RuntimeError(f"Database schema of {DATABASE} is outdated; run "
+                           f"'python3 webserver.py --migrate' before starting the WSGI server")
\ No newline at end of file